@@ -0,0 +1,71 @@
+"""
+Perhitungan agregat yang dipakai halaman dashboard dan API JSON:
+ringkasan global per tahun, ranking negara, dan profil satu negara.
+
+Semua fungsi hanya memakai `data_store.query` (tanpa Streamlit), jadi bisa
+dipanggil dari halaman, thread prefetch, maupun server API.
+"""
+from typing import Dict, Tuple
+
+import pandas as pd
+
+from data_store import query
+
+# Indikator yang nilainya makin rendah makin baik
+LOWER_IS_BETTER = {"Maternal Mortality"}
+
+
+def global_summary(year: int) -> pd.DataFrame:
+    """Rata-rata, minimum, dan maksimum tiap indikator pada satu tahun."""
+    # Hanya kolom tahun terpilih yang dibaca dari store
+    df_year = query(years=[year], columns=["value", "indicator"])
+    return (
+        df_year.groupby("indicator")["value"]
+        .agg(["mean", "min", "max"])
+        .reset_index()
+    )
+
+
+def rank_countries(df: pd.DataFrame, indicator: str, n: int, best: bool = True) -> pd.DataFrame:
+    """
+    Urutkan negara dari yang terbaik (best=True) atau terburuk (best=False)
+    sesuai arah indikator, lalu ambil n teratas.
+    """
+    ascending = indicator in LOWER_IS_BETTER
+    if not best:
+        ascending = not ascending
+    return df.sort_values("value", ascending=ascending).head(n)
+
+
+def top_bottom(indicator: str, year: int, n: int = 10) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Top n dan Bottom n negara untuk satu indikator dan tahun."""
+    df_ind = query(indicators=[indicator], years=[year], columns=["country", "country_code", "value"])
+    return rank_countries(df_ind, indicator, n), rank_countries(df_ind, indicator, n, best=False)
+
+
+def country_profile(country: str) -> Dict[str, pd.DataFrame]:
+    """
+    Profil satu negara (nama atau kode ISO3):
+    - series: long format year | value | indicator, urut tahun
+    - latest: nilai terbaru per indikator
+    - pivot: tabel tahun x indikator
+    """
+    # Predicate negara diteruskan ke store, negara lain tidak dibaca
+    series = query(countries=[country], columns=["year", "value", "indicator"]).sort_values("year")
+
+    latest = series.groupby("indicator", sort=False).tail(1).reset_index(drop=True)
+
+    if series.empty:
+        return {"series": series, "latest": latest, "pivot": pd.DataFrame(columns=["year"])}
+
+    pivot = (
+        series.pivot_table(
+            index="year",
+            columns="indicator",
+            values="value",
+        )
+        .reset_index()
+        .sort_values("year")
+    )
+
+    return {"series": series, "latest": latest, "pivot": pivot}
@@ -0,0 +1,430 @@
+"""
+API JSON lokal untuk agregat dashboard (ranking, profil negara, ringkasan
+global), dijalankan berdampingan dengan aplikasi Streamlit:
+
+    python api_server.py --port 8502
+
+Endpoint (GET):
+    /api/version                            versi data
+    /api/indicators                         daftar indikator dan tahun
+    /api/countries                          daftar negara
+    /api/summary?year=2023                  ringkasan global per indikator
+    /api/rankings?indicator=...&year=...&n=10&order=top|bottom
+    /api/profile?country=Indonesia          profil satu negara (nama / ISO3 / alias)
+    /api/export?format=csv|parquet&indicator=...&year=...&country=...&column=...
+                                            export streaming (parameter boleh diulang)
+
+Respons di-cache (namespace "api" pada `cache_manager`) lengkap dengan
+body gzip dan ETag yang memuat `data_version()`, sehingga request berulang
+hanya berupa lookup cache dan klien bisa revalidasi lewat If-None-Match.
+Export tidak di-cache: dialirkan per potongan dengan chunked transfer
+encoding, jadi cocok untuk potongan besar (mis. seluruh panel).
+"""
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from aggregates import country_profile, global_summary, top_bottom
+from cache_manager import get_cache
+from country_index import get_country_index
+from data_store import (
+    LONG_COLUMNS,
+    available_indicators,
+    available_years,
+    data_version,
+    list_countries,
+)
+from export import FORMATS, export_filename, write_export
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8502
+MAX_RANKING_N = 300
+# Body lebih kecil dari ini tidak perlu di-gzip
+GZIP_MIN_BYTES = 512
+# Ukuran potongan chunked transfer encoding pada /api/export
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Route(NamedTuple):
+    handler: Callable[[Dict[str, str]], Any]
+    # Parameter yang dibaca handler; parameter lain (mis. cache-buster
+    # "_=...") diabaikan dan tidak ikut key cache
+    params: Tuple[str, ...] = ()
+
+
+class Response(NamedTuple):
+    status: int
+    body: bytes
+    gzip_body: Optional[bytes]
+    etag: str
+
+
+# =========================
+# HANDLER QUERY
+# =========================
+def _records(df: pd.DataFrame) -> list:
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+def _int_param(params: Dict[str, str], name: str, default: Optional[int] = None) -> int:
+    raw = params.get(name)
+    if raw is None:
+        if default is None:
+            raise ApiError(400, f"Parameter '{name}' wajib diisi")
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        raise ApiError(400, f"Parameter '{name}' harus berupa angka") from None
+
+
+def _indicator_param(params: Dict[str, str]) -> str:
+    indicator = params.get("indicator")
+    if indicator not in available_indicators():
+        raise ApiError(400, f"Indikator tidak dikenal: {indicator!r}")
+    return indicator
+
+
+def _year_param(params: Dict[str, str]) -> int:
+    year = _int_param(params, "year")
+    if year not in available_years():
+        raise ApiError(404, f"Tahun {year} tidak tersedia")
+    return year
+
+
+def api_version(params: Dict[str, str]) -> Any:
+    return {"data_version": data_version()}
+
+
+def api_indicators(params: Dict[str, str]) -> Any:
+    return {
+        "indicators": available_indicators(),
+        "years": available_years(),
+    }
+
+
+def api_countries(params: Dict[str, str]) -> Any:
+    return {"countries": list_countries()}
+
+
+def api_summary(params: Dict[str, str]) -> Any:
+    year = _year_param(params)
+    return {"year": year, "summary": _records(global_summary(year))}
+
+
+def api_rankings(params: Dict[str, str]) -> Any:
+    indicator = _indicator_param(params)
+    year = _year_param(params)
+    n = _int_param(params, "n", 10)
+    if not 1 <= n <= MAX_RANKING_N:
+        raise ApiError(400, f"Parameter 'n' harus di antara 1 dan {MAX_RANKING_N}")
+    order = params.get("order", "top")
+    if order not in ("top", "bottom"):
+        raise ApiError(400, "Parameter 'order' harus 'top' atau 'bottom'")
+
+    top, bottom = top_bottom(indicator, year, n=n)
+    ranked = top if order == "top" else bottom
+    return {
+        "indicator": indicator,
+        "year": year,
+        "order": order,
+        "rankings": _records(ranked),
+    }
+
+
+def api_profile(params: Dict[str, str]) -> Any:
+    country = params.get("country")
+    if not country:
+        raise ApiError(400, "Parameter 'country' wajib diisi")
+    index = get_country_index()
+    code = index.lookup(country)
+    profile = country_profile(code or country)
+    if profile["series"].empty:
+        raise ApiError(404, f"Negara tidak ditemukan: {country!r}")
+    return {
+        "country": index.name(code) if code else country,
+        "country_code": code,
+        "latest": _records(profile["latest"]),
+        "series": _records(profile["series"]),
+    }
+
+
+ROUTES: Dict[str, Route] = {
+    "/api/version": Route(api_version),
+    "/api/indicators": Route(api_indicators),
+    "/api/countries": Route(api_countries),
+    "/api/summary": Route(api_summary, ("year",)),
+    "/api/rankings": Route(api_rankings, ("indicator", "year", "n", "order")),
+    "/api/profile": Route(api_profile, ("country",)),
+}
+
+
+# =========================
+# RESPON (DI-CACHE)
+# =========================
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Tidak bisa diubah ke JSON: {type(value).__name__}")
+
+
+def _build_response(path: str, params: Dict[str, str], version: str) -> Response:
+    route = ROUTES.get(path)
+    try:
+        if route is None:
+            raise ApiError(404, f"Endpoint tidak dikenal: {path}")
+        status, payload = 200, route.handler(params)
+    except ApiError as exc:
+        status, payload = exc.status, {"error": str(exc)}
+
+    body = json.dumps(payload, ensure_ascii=False, default=_json_default).encode("utf-8")
+    gzip_body = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+    etag = f'"{version}-{hashlib.sha1(body).hexdigest()[:16]}"'
+    return Response(status, body, gzip_body, etag)
+
+
+def get_response(path: str, params: Dict[str, str]) -> Response:
+    """
+    Respons dari cache; dihitung sekali per (versi data, path, parameter).
+    Hanya parameter yang dideklarasikan route yang dipakai, jadi parameter
+    tambahan tidak membuat entri cache baru. Hanya respons 200 yang
+    di-cache: path atau nilai parameter yang salah tidak boleh mendesak
+    keluar hasil precompute dan data halaman dari budget cache bersama.
+    """
+    version = data_version()
+    route = ROUTES.get(path)
+    if route is None:
+        return _build_response(path, {}, version)
+
+    params = {name: params[name] for name in route.params if name in params}
+    key = (version, path, tuple(sorted(params.items())))
+    cache = get_cache()
+    missing = object()
+    resp = cache.get("api", key, missing)
+    if resp is missing:
+        resp = _build_response(path, params, version)
+        if resp.status == 200:
+            cache.put("api", key, resp)
+    return resp
+
+
+def precompute() -> int:
+    """Hitung lebih dulu ringkasan dan ranking semua indikator x tahun."""
+    count = 0
+    for year in available_years():
+        get_response("/api/summary", {"year": str(year)})
+        count += 1
+        for indicator in available_indicators():
+            for order in ("top", "bottom"):
+                get_response(
+                    "/api/rankings",
+                    {"indicator": indicator, "year": str(year), "order": order},
+                )
+                count += 1
+    for path in ("/api/version", "/api/indicators", "/api/countries"):
+        get_response(path, {})
+        count += 1
+    return count
+
+
+# =========================
+# EXPORT (STREAMING)
+# =========================
+def export_selection(query: Dict[str, List[str]]) -> Tuple[str, dict]:
+    """Format dan argumen `write_export` dari query string (nilai boleh diulang)."""
+    fmt = query.get("format", ["csv"])[-1]
+    if fmt not in FORMATS:
+        raise ApiError(400, f"Parameter 'format' harus salah satu dari {sorted(FORMATS)}")
+
+    indicators = query.get("indicator")
+    unknown = [i for i in indicators or [] if i not in available_indicators()]
+    if unknown:
+        raise ApiError(400, f"Indikator tidak dikenal: {unknown}")
+
+    try:
+        years = [int(y) for y in query["year"]] if "year" in query else None
+    except ValueError:
+        raise ApiError(400, "Parameter 'year' harus berupa angka") from None
+
+    columns = query.get("column")
+    if columns is not None and not set(columns) <= set(LONG_COLUMNS):
+        raise ApiError(400, f"Parameter 'column' harus di antara {LONG_COLUMNS}")
+
+    return fmt, dict(
+        indicators=indicators,
+        years=years,
+        countries=query.get("country"),
+        columns=columns,
+    )
+
+
+class _ChunkedWriter(io.RawIOBase):
+    """File tujuan `write_export` yang menulis chunked transfer encoding."""
+
+    def __init__(self, wfile, chunk_bytes: int = EXPORT_CHUNK_BYTES):
+        super().__init__()
+        self.wfile = wfile
+        self.chunk_bytes = chunk_bytes
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        if len(self._buffer) >= self.chunk_bytes:
+            self._send_chunk()
+        return len(data)
+
+    def _send_chunk(self) -> None:
+        if self._buffer:
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(self._buffer), bytes(self._buffer)))
+            self._buffer.clear()
+
+    def close(self) -> None:
+        if not self.closed:
+            self._send_chunk()
+            self.wfile.write(b"0\r\n\r\n")
+        super().close()
+
+    def abort(self) -> None:
+        """Tutup tanpa chunk penutup (body tidak lengkap)."""
+        self._buffer.clear()
+        super().close()
+
+
+# =========================
+# HTTP SERVER
+# =========================
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [t.strip() for t in header.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "WomenDashboardAPI/1.0"
+    # Header dan body ditulis terpisah; tanpa ini Nagle + delayed ACK
+    # menambah ~40 ms per request pada koneksi keep-alive
+    disable_nagle_algorithm = True
+    quiet = True
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        path = url.path.rstrip("/") or "/"
+        if path == "/api/export":
+            self._send_export(parse_qs(url.query))
+            return
+
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        resp = get_response(path, params)
+
+        if resp.status == 200 and _etag_matches(self.headers.get("If-None-Match"), resp.etag):
+            self.send_response(304)
+            self.send_header("ETag", resp.etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        accepts_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+        body = resp.gzip_body if accepts_gzip and resp.gzip_body is not None else resp.body
+
+        self.send_response(resp.status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Vary", "Accept-Encoding")
+        if body is resp.gzip_body:
+            self.send_header("Content-Encoding", "gzip")
+        if resp.status == 200:
+            self.send_header("ETag", resp.etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_export(self, query: Dict[str, List[str]]) -> None:
+        try:
+            fmt, selection = export_selection(query)
+        except ApiError as exc:
+            body = json.dumps({"error": str(exc)}, ensure_ascii=False).encode("utf-8")
+            self.send_response(exc.status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        filename = export_filename(fmt, *(selection["indicators"] or []), *(selection["years"] or []))
+        self.send_response(200)
+        self.send_header("Content-Type", FORMATS[fmt])
+        self.send_header("Content-Disposition", f'attachment; filename="{filename}"')
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        sink = _ChunkedWriter(self.wfile)
+        try:
+            write_export(fmt, sink, **selection)
+        except Exception:
+            # Status 200 sudah terkirim; putuskan koneksi tanpa chunk penutup
+            # supaya klien tahu body-nya tidak lengkap
+            self.close_connection = True
+            sink.abort()
+            raise
+        sink.close()
+
+    def log_message(self, format: str, *args) -> None:
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, verbose: bool = False):
+    handler = type("Handler", (ApiHandler,), {"quiet": not verbose})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="API JSON lokal untuk agregat dashboard.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--no-precompute", action="store_true",
+                        help="Jangan hitung ranking/ringkasan di awal.")
+    parser.add_argument("--verbose", action="store_true", help="Tampilkan log tiap request.")
+    args = parser.parse_args(argv)
+
+    if not args.no_precompute:
+        print(f"Precompute {precompute()} respons ...", file=sys.stderr)
+
+    server = make_server(args.host, args.port, args.verbose)
+    print(f"API berjalan di http://{args.host}:{server.server_address[1]}/api/", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
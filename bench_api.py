@@ -0,0 +1,125 @@
+"""
+Benchmark throughput API JSON lokal (requests/detik) pada beberapa tingkat
+konkurensi. Tiap worker memakai satu koneksi keep-alive sendiri.
+
+    python bench_api.py                      # jalankan server sendiri di thread
+    python bench_api.py --url http://127.0.0.1:8502 --concurrency 1 8 32
+
+Dua skenario per tingkat konkurensi:
+- full: request biasa dengan Accept-Encoding: gzip
+- etag: request dengan If-None-Match (respons 304 tanpa body)
+"""
+import argparse
+import http.client
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from data_store import available_indicators, available_years
+
+DEFAULT_REQUESTS = 2000
+DEFAULT_CONCURRENCY = [1, 4, 16]
+
+
+def sample_paths(k: int, seed: int = 0) -> List[str]:
+    """Campuran request ranking, ringkasan, dan profil negara."""
+    rng = random.Random(seed)
+    indicators = available_indicators()
+    years = available_years()
+    countries = ["IDN", "MYS", "JPN", "IND", "BRA", "NGA", "DEU", "USA"]
+    paths = []
+    for _ in range(k):
+        kind = rng.random()
+        if kind < 0.5:
+            params = {
+                "indicator": rng.choice(indicators),
+                "year": rng.choice(years),
+                "order": rng.choice(["top", "bottom"]),
+            }
+            paths.append("/api/rankings?" + urlencode(params))
+        elif kind < 0.8:
+            paths.append("/api/summary?" + urlencode({"year": rng.choice(years)}))
+        else:
+            paths.append("/api/profile?" + urlencode({"country": rng.choice(countries)}))
+    return paths
+
+
+def _worker(host: str, port: int, paths: List[str], use_etag: bool) -> Tuple[int, int]:
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    etags = {}
+    ok = not_modified = 0
+    for path in paths:
+        headers = {"Accept-Encoding": "gzip"}
+        if use_etag and path in etags:
+            headers["If-None-Match"] = etags[path]
+        conn.request("GET", path, headers=headers)
+        resp = conn.getresponse()
+        resp.read()
+        if resp.status == 304:
+            not_modified += 1
+        elif resp.status == 200:
+            ok += 1
+            etags[path] = resp.getheader("ETag")
+    conn.close()
+    return ok, not_modified
+
+
+def run(host: str, port: int, total: int, concurrency: int, use_etag: bool) -> dict:
+    paths = sample_paths(total)
+    chunks = [paths[i::concurrency] for i in range(concurrency)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda c: _worker(host, port, c, use_etag), chunks))
+    elapsed = time.perf_counter() - start
+    return {
+        "scenario": "etag" if use_etag else "full",
+        "concurrency": concurrency,
+        "requests": total,
+        "ok": sum(r[0] for r in results),
+        "not_modified": sum(r[1] for r in results),
+        "seconds": elapsed,
+        "rps": total / elapsed if elapsed else 0.0,
+    }
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark throughput API JSON lokal.")
+    parser.add_argument("--url", help="URL server yang sudah berjalan. Default: server lokal di thread.")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=DEFAULT_CONCURRENCY)
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        from api_server import make_server, precompute
+
+        precompute()
+        server = make_server(port=0)
+        host, port = server.server_address[:2]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    print(f"{'scenario':<9}{'conc':>6}{'requests':>10}{'200':>7}{'304':>7}{'sec':>8}{'req/s':>10}")
+    try:
+        for concurrency in args.concurrency:
+            for use_etag in (False, True):
+                r = run(host, port, args.requests, concurrency, use_etag)
+                print(
+                    f"{r['scenario']:<9}{r['concurrency']:>6}{r['requests']:>10}"
+                    f"{r['ok']:>7}{r['not_modified']:>7}{r['seconds']:>8.2f}{r['rps']:>10.0f}"
+                )
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
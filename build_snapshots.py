@@ -0,0 +1,302 @@
+"""
+Render semua tampilan umum dashboard ke file statis HTML/JSON:
+
+- rankings/<indikator>/<tahun>_top|bottom.html/.json  (Top/Bottom 10 Overview)
+- profiles/<ISO3>.html/.json                           (Country Profile)
+
+Panel dibaca sekali lewat `data_store.query()` lalu dibagikan ke worker
+process pool saat inisialisasi. Setiap tampilan punya hash dari potongan
+data yang dipakainya; tampilan yang hash-nya sama dengan `manifest.json`
+dan file-nya masih ada dilewati. Manifest diperbarui sambil jalan, jadi
+render yang gagal/terputus tidak membuang tampilan yang sudah selesai.
+Tampilan yang tidak ada lagi di panel (negara hilang, tahun di luar
+rentang) dihapus dari manifest beserta file-nya.
+
+    python build_snapshots.py --out snapshots --workers 4
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from aggregates import rank_countries
+from data_store import BASE_DIR, data_version, query
+from figures import RANKING_LABELS, TREND_LABELS, ranking_bar, trend_line
+
+DEFAULT_OUT_DIR = os.path.join(BASE_DIR, "snapshots")
+MANIFEST_FILE = "manifest.json"
+RANKING_N = 10
+# Manifest ditulis ulang setiap sekian tampilan selesai
+MANIFEST_FLUSH_EVERY = 50
+
+# Naikkan kalau format output/tampilan grafik berubah, supaya semua
+# snapshot di-render ulang walaupun datanya sama
+SNAPSHOT_FORMAT = 1
+
+# Panel per worker, diisi oleh _init_worker
+_RANK_GROUPS: Dict[Tuple[str, int], pd.DataFrame] = {}
+_PROFILE_GROUPS: Dict[str, pd.DataFrame] = {}
+
+
+# =========================
+# PEMBAGIAN PANEL
+# =========================
+def _group_panel(panel: pd.DataFrame):
+    rank_groups = {
+        (indicator, int(year)): g[["country", "country_code", "value"]]
+        for (indicator, year), g in panel.groupby(["indicator", "year"], sort=False)
+    }
+    profile_groups = {
+        code: g[["country", "year", "value", "indicator"]].sort_values("year")
+        for code, g in panel.groupby("country_code", sort=False)
+    }
+    return rank_groups, profile_groups
+
+
+def _init_worker(panel: pd.DataFrame) -> None:
+    global _RANK_GROUPS, _PROFILE_GROUPS
+    _RANK_GROUPS, _PROFILE_GROUPS = _group_panel(panel)
+
+
+def _slug(text: str) -> str:
+    return "".join(ch if ch.isalnum() else "_" for ch in text.lower()).strip("_")
+
+
+def _hash_frame(df: pd.DataFrame) -> str:
+    h = hashlib.sha1(f"v{SNAPSHOT_FORMAT};".encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return h.hexdigest()[:16]
+
+
+# =========================
+# RENDER (di dalam worker)
+# =========================
+def _write_atomic(path: str, text: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Nama sementara unik, supaya builder lain di --out yang sama tidak
+    # menimpa file sementara ini (sama seperti data_store._write_parquet)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        # mkstemp membuat file 0600; snapshot statis perlu bisa dibaca web server
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _html_page(title: str, sections: List[Tuple[str, object]]) -> str:
+    title = html.escape(title)
+    parts = [f"<h1>{title}</h1>"]
+    for i, (heading, fig) in enumerate(sections):
+        parts.append(f"<h3>{html.escape(heading)}</h3>")
+        parts.append(fig.to_html(full_html=False, include_plotlyjs="cdn" if i == 0 else False))
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+        f"<title>{title}</title></head><body>{''.join(parts)}</body></html>"
+    )
+
+
+def _render_ranking(out_dir: str, indicator: str, year: int, order: str) -> List[str]:
+    df_ind = _RANK_GROUPS[(indicator, year)]
+    ranked = rank_countries(df_ind, indicator, RANKING_N, best=(order == "top"))
+    label = RANKING_LABELS[indicator]
+    fig = ranking_bar(ranked, label)
+
+    base = os.path.join(out_dir, "rankings", _slug(indicator), f"{year}_{order}")
+    title = f"{'Top' if order == 'top' else 'Bottom'} {RANKING_N} Negara – {label} ({year})"
+    _write_atomic(base + ".html", _html_page(title, [(label, fig)]))
+    _write_atomic(base + ".json", fig.to_json())
+    return [base + ".html", base + ".json"]
+
+
+def _render_profile(out_dir: str, code: str) -> List[str]:
+    df_c = _PROFILE_GROUPS[code]
+    country = df_c["country"].iloc[0]
+
+    sections = []
+    figures = {}
+    for indicator, label in TREND_LABELS.items():
+        dfi = df_c[df_c["indicator"] == indicator]
+        if dfi.empty:
+            continue
+        fig = trend_line(dfi, label)
+        sections.append((label, fig))
+        figures[indicator] = json.loads(fig.to_json())
+
+    latest = df_c.groupby("indicator", sort=False).tail(1)
+    payload = {
+        "country": country,
+        "country_code": code,
+        "latest": latest[["indicator", "year", "value"]].to_dict(orient="records"),
+        "figures": figures,
+    }
+
+    base = os.path.join(out_dir, "profiles", code)
+    _write_atomic(base + ".html", _html_page(f"Profil Indikator Perempuan – {country}", sections))
+    _write_atomic(base + ".json", json.dumps(payload, ensure_ascii=False))
+    return [base + ".html", base + ".json"]
+
+
+def _render(task: tuple) -> Tuple[str, List[str]]:
+    key, out_dir, kind, args = task
+    if kind == "ranking":
+        return key, _render_ranking(out_dir, *args)
+    return key, _render_profile(out_dir, *args)
+
+
+# =========================
+# PERENCANAAN & EKSEKUSI
+# =========================
+def plan_tasks(panel: pd.DataFrame, only: Optional[str] = None) -> Dict[str, tuple]:
+    """key tampilan -> (hash data, jenis, argumen render)."""
+    rank_groups, profile_groups = _group_panel(panel)
+    tasks = {}
+
+    if only in (None, "rankings"):
+        for (indicator, year), g in rank_groups.items():
+            digest = _hash_frame(g)
+            for order in ("top", "bottom"):
+                key = f"rankings/{_slug(indicator)}/{year}_{order}"
+                tasks[key] = (digest, "ranking", (indicator, year, order))
+
+    if only in (None, "profiles"):
+        for code, g in profile_groups.items():
+            tasks[f"profiles/{code}"] = (_hash_frame(g), "profile", (code,))
+
+    return tasks
+
+
+def _load_manifest(out_dir: str) -> dict:
+    path = os.path.join(out_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {"views": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _is_fresh(out_dir: str, key: str, digest: str, manifest: dict) -> bool:
+    entry = manifest["views"].get(key)
+    if entry is None or entry["hash"] != digest:
+        return False
+    return all(os.path.exists(os.path.join(out_dir, p)) for p in entry["files"])
+
+
+def _write_manifest(out_dir: str, manifest: dict) -> None:
+    manifest["data_version"] = data_version()
+    manifest["format"] = SNAPSHOT_FORMAT
+    _write_atomic(os.path.join(out_dir, MANIFEST_FILE), json.dumps(manifest, indent=1))
+
+
+def prune_views(
+    out_dir: str, tasks: Dict[str, tuple], manifest: dict, only: Optional[str] = None
+) -> List[str]:
+    """Hapus tampilan di manifest yang tidak direncanakan lagi (beserta file-nya)."""
+    removed = []
+    for key in list(manifest["views"]):
+        if key in tasks or (only is not None and not key.startswith(only + "/")):
+            continue
+        for rel in manifest["views"].pop(key)["files"]:
+            path = os.path.join(out_dir, rel)
+            if os.path.exists(path):
+                os.remove(path)
+            try:
+                os.rmdir(os.path.dirname(path))  # hanya kalau folder sudah kosong
+            except OSError:
+                pass
+        removed.append(key)
+    return removed
+
+
+def build_snapshots(
+    out_dir: str = DEFAULT_OUT_DIR,
+    workers: Optional[int] = None,
+    force: bool = False,
+    only: Optional[str] = None,
+) -> dict:
+    """
+    Render tampilan yang berubah. Mengembalikan ringkasan jumlah tampilan
+    beserta key tampilan yang gagal di-render ("failed": key -> pesan error).
+    """
+    panel = query()
+    tasks = plan_tasks(panel, only)
+    manifest = _load_manifest(out_dir)
+    removed = prune_views(out_dir, tasks, manifest, only)
+
+    todo = [
+        (key, out_dir, kind, args)
+        for key, (digest, kind, args) in tasks.items()
+        if force or not _is_fresh(out_dir, key, digest, manifest)
+    ]
+    failed: Dict[str, str] = {}
+
+    try:
+        if todo:
+            workers = workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(panel,)
+            ) as pool:
+                futures = {pool.submit(_render, task): task[0] for task in todo}
+                for done, future in enumerate(as_completed(futures), 1):
+                    key = futures[future]
+                    try:
+                        _, files = future.result()
+                    except Exception as exc:
+                        # Entri lama dibuang supaya tampilan ini dicoba lagi
+                        manifest["views"].pop(key, None)
+                        failed[key] = f"{type(exc).__name__}: {exc}"
+                        continue
+                    manifest["views"][key] = {
+                        "hash": tasks[key][0],
+                        "files": [os.path.relpath(p, out_dir) for p in files],
+                    }
+                    if done % MANIFEST_FLUSH_EVERY == 0:
+                        _write_manifest(out_dir, manifest)
+    finally:
+        _write_manifest(out_dir, manifest)
+
+    return {
+        "views": len(tasks),
+        "rendered": len(todo) - len(failed),
+        "skipped": len(tasks) - len(todo),
+        "removed": len(removed),
+        "failed": failed,
+    }
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Render snapshot statis semua tampilan dashboard.")
+    parser.add_argument("--out", default=DEFAULT_OUT_DIR, help="Folder output.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Jumlah process worker. Default: jumlah CPU.")
+    parser.add_argument("--only", choices=["rankings", "profiles"],
+                        help="Hanya render satu jenis tampilan.")
+    parser.add_argument("--force", action="store_true",
+                        help="Render ulang walaupun data tidak berubah.")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    result = build_snapshots(args.out, args.workers, args.force, args.only)
+    print(
+        f"{result['rendered']} tampilan di-render, {result['skipped']} dilewati, "
+        f"{result['removed']} dihapus (total {result['views']}) "
+        f"dalam {time.perf_counter() - start:.1f} detik → {args.out}"
+    )
+    for key, error in sorted(result["failed"].items()):
+        print(f"GAGAL {key}: {error}", file=sys.stderr)
+    return 1 if result["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""
+Cache terpusat untuk lapisan data dan halaman dashboard.
+
+Semua hasil yang di-cache (DataFrame, array, figure plotly) dihitung
+ukurannya dalam byte dan dijumlahkan terhadap satu memory budget global.
+Kalau budget terlampaui, entri dibuang memakai kebijakan LRU atau LFU.
+Tiap namespace bisa punya TTL sendiri.
+
+Konfigurasi lewat environment variable:
+- DASHBOARD_CACHE_MB      : memory budget dalam MB (default 256)
+- DASHBOARD_CACHE_POLICY  : "lru" atau "lfu" (default "lru")
+"""
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MEMORY_BUDGET = int(os.environ.get("DASHBOARD_CACHE_MB", "256")) * 1024 * 1024
+DEFAULT_POLICY = os.environ.get("DASHBOARD_CACHE_POLICY", "lru").lower()
+
+# TTL (detik) per namespace; None = tidak kedaluwarsa.
+# Semua key diawali `data_version()`, jadi data baru tidak pernah tertutup
+# entri lama; TTL "tables"/"figures" hanya pembatas memori untuk entri yang
+# sudah jarang dipakai.
+DEFAULT_NAMESPACE_TTLS: Dict[str, Optional[float]] = {
+    "query": None,
+    "api": None,
+    "tables": 3600,
+    "figures": 3600,
+}
+
+POLICIES = ("lru", "lfu")
+
+
+def estimate_size(value: Any) -> int:
+    """Perkiraan ukuran objek dalam byte."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k) + estimate_size(v) for k, v in value.items()
+        )
+    if hasattr(value, "to_plotly_json"):
+        # Figure plotly: ukur dari hasil serialisasi JSON-nya
+        return len(value.to_json())
+    return sys.getsizeof(value)
+
+
+class _Entry:
+    __slots__ = ("value", "size", "expires_at", "hits")
+
+    def __init__(self, value: Any, size: int, expires_at: Optional[float]):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.hits = 0
+
+
+class CacheManager:
+    """
+    Cache key-value dengan akuntansi ukuran dan memory budget global.
+
+    - get / put / get_or_compute per namespace
+    - eviction LRU atau LFU kalau total ukuran melewati budget
+    - TTL per namespace (dicek saat akses dan saat eviction)
+    - stats(): hit/miss/eviction per namespace dan total
+    - add_listener(fn): fn(namespace, key, reason) dipanggil saat entri
+      dibuang ("evicted" / "expired" / "invalidated" / "replaced")
+    """
+
+    def __init__(
+        self,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        policy: str = DEFAULT_POLICY,
+        namespace_ttls: Optional[Dict[str, Optional[float]]] = None,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Kebijakan cache tidak dikenal: {policy!r} (pilih {POLICIES})")
+        self.memory_budget = memory_budget
+        self.policy = policy
+        self.namespace_ttls = dict(DEFAULT_NAMESPACE_TTLS)
+        if namespace_ttls:
+            self.namespace_ttls.update(namespace_ttls)
+
+        self._lock = threading.RLock()
+        # (namespace, key) -> _Entry, urutan = urutan akses terakhir (LRU)
+        self._entries: "OrderedDict[Tuple[str, Hashable], _Entry]" = OrderedDict()
+        self._used_bytes = 0
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._listeners: List[Callable[[str, Hashable, str], None]] = []
+
+    # -------------------------
+    # Konfigurasi
+    # -------------------------
+    def set_ttl(self, namespace: str, ttl: Optional[float]) -> None:
+        with self._lock:
+            self.namespace_ttls[namespace] = ttl
+
+    def add_listener(self, fn: Callable[[str, Hashable, str], None]) -> None:
+        with self._lock:
+            self._listeners.append(fn)
+
+    # -------------------------
+    # Internal
+    # -------------------------
+    def _ns_stats(self, namespace: str) -> Dict[str, int]:
+        if namespace not in self._stats:
+            self._stats[namespace] = {
+                "hits": 0,
+                "misses": 0,
+                "evictions": 0,
+                "expirations": 0,
+                "rejected": 0,
+            }
+        return self._stats[namespace]
+
+    def _remove_locked(self, full_key, reason: str, removed: list) -> None:
+        entry = self._entries.pop(full_key)
+        self._used_bytes -= entry.size
+        stats = self._ns_stats(full_key[0])
+        if reason == "evicted":
+            stats["evictions"] += 1
+        elif reason == "expired":
+            stats["expirations"] += 1
+        removed.append((full_key[0], full_key[1], reason))
+
+    def _pick_victim_locked(self):
+        if self.policy == "lru":
+            return next(iter(self._entries))
+        # LFU: hit paling sedikit; kalau seri, yang paling lama tidak diakses
+        return min(
+            enumerate(self._entries.items()),
+            key=lambda item: (item[1][1].hits, item[0]),
+        )[1][0]
+
+    def _enforce_budget_locked(self, removed: list) -> None:
+        now = time.monotonic()
+        expired = [
+            k for k, e in self._entries.items()
+            if e.expires_at is not None and e.expires_at <= now
+        ]
+        for k in expired:
+            self._remove_locked(k, "expired", removed)
+
+        while self._used_bytes > self.memory_budget and self._entries:
+            self._remove_locked(self._pick_victim_locked(), "evicted", removed)
+
+    def _notify(self, removed: list) -> None:
+        # Listener dipanggil di luar lock supaya tidak terjadi deadlock
+        for namespace, key, reason in removed:
+            for fn in self._listeners:
+                fn(namespace, key, reason)
+
+    # -------------------------
+    # API
+    # -------------------------
+    def get(self, namespace: str, key: Hashable, default: Any = None) -> Any:
+        removed: list = []
+        with self._lock:
+            full_key = (namespace, key)
+            stats = self._ns_stats(namespace)
+            entry = self._entries.get(full_key)
+            if entry is not None and entry.expires_at is not None \
+                    and entry.expires_at <= time.monotonic():
+                self._remove_locked(full_key, "expired", removed)
+                entry = None
+
+            if entry is None:
+                stats["misses"] += 1
+                value = default
+            else:
+                stats["hits"] += 1
+                entry.hits += 1
+                self._entries.move_to_end(full_key)
+                value = entry.value
+        self._notify(removed)
+        return value
+
+    def contains(self, namespace: str, key: Hashable) -> bool:
+        """Cek keberadaan entri tanpa mengubah statistik."""
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            return entry is not None and (
+                entry.expires_at is None or entry.expires_at > time.monotonic()
+            )
+
+    def put(self, namespace: str, key: Hashable, value: Any) -> bool:
+        """Simpan nilai. False kalau nilai lebih besar dari seluruh budget."""
+        size = estimate_size(value)
+        removed: list = []
+        with self._lock:
+            stats = self._ns_stats(namespace)
+            if size > self.memory_budget:
+                stats["rejected"] += 1
+                return False
+            full_key = (namespace, key)
+            if full_key in self._entries:
+                self._remove_locked(full_key, "replaced", removed)
+            ttl = self.namespace_ttls.get(namespace)
+            expires_at = time.monotonic() + ttl if ttl is not None else None
+            self._entries[full_key] = _Entry(value, size, expires_at)
+            self._used_bytes += size
+            self._enforce_budget_locked(removed)
+        self._notify(removed)
+        return True
+
+    def get_or_compute(self, namespace: str, key: Hashable, compute: Callable[[], Any]) -> Any:
+        missing = object()
+        value = self.get(namespace, key, missing)
+        if value is missing:
+            value = compute()
+            self.put(namespace, key, value)
+        return value
+
+    def invalidate(self, namespace: Optional[str] = None) -> int:
+        """Hapus semua entri (atau satu namespace). Mengembalikan jumlah entri."""
+        removed: list = []
+        with self._lock:
+            keys = [k for k in self._entries if namespace is None or k[0] == namespace]
+            for k in keys:
+                self._remove_locked(k, "invalidated", removed)
+        self._notify(removed)
+        return len(removed)
+
+    @property
+    def used_bytes(self) -> int:
+        return self._used_bytes
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            namespaces: Dict[str, Dict[str, Any]] = {
+                ns: dict(s, entries=0, bytes=0) for ns, s in self._stats.items()
+            }
+            for (ns, _), entry in self._entries.items():
+                namespaces[ns]["entries"] += 1
+                namespaces[ns]["bytes"] += entry.size
+
+            total = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+            for s in namespaces.values():
+                for k in total:
+                    total[k] += s[k]
+                lookups = s["hits"] + s["misses"]
+                s["hit_rate"] = s["hits"] / lookups if lookups else 0.0
+
+            lookups = total["hits"] + total["misses"]
+            return {
+                "policy": self.policy,
+                "memory_budget": self.memory_budget,
+                "used_bytes": self._used_bytes,
+                "entries": len(self._entries),
+                **total,
+                "hit_rate": total["hits"] / lookups if lookups else 0.0,
+                "namespaces": namespaces,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> CacheManager:
+    """Satu CacheManager per proses, dipakai bersama oleh data layer dan halaman."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = CacheManager()
+        return _cache
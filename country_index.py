@@ -0,0 +1,224 @@
+"""
+Indeks pencarian negara untuk selectbox/multiselect dan API.
+
+Dibangun sekali per versi data dari pasangan nama | kode ISO3 di store,
+ditambah alias (nama populer, bentuk tanpa ", Rep." dst.). Nilai opsi
+widget adalah kode entitas, bukan nama, karena nama bisa kembar (mis.
+"Punjab" di IN dan PK); nama hanya untuk label. Isinya:
+- daftar kode terurut per nama + posisi tiap kode (O(1))
+- lookup nama/kode/alias -> kode (O(1))
+- daftar kunci terurut untuk pencarian prefix (bisect)
+- indeks trigram untuk pencarian fuzzy (salah ketik)
+"""
+import bisect
+import difflib
+import re
+import sys
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from cache_manager import get_cache
+from data_store import data_version, query
+
+# Alias tambahan per kode ISO3 (nama World Bank sering berbeda dari nama populer)
+ALIASES: Dict[str, List[str]] = {
+    "USA": ["United States of America", "US", "America", "Amerika Serikat"],
+    "GBR": ["UK", "Great Britain", "Britain", "Inggris"],
+    "KOR": ["South Korea", "Korea Selatan"],
+    "PRK": ["North Korea", "Korea Utara"],
+    "RUS": ["Russia", "Rusia"],
+    "IRN": ["Iran"],
+    "EGY": ["Egypt", "Mesir"],
+    "VNM": ["Vietnam"],
+    "LAO": ["Laos"],
+    "CIV": ["Ivory Coast", "Pantai Gading"],
+    "CZE": ["Czech Republic"],
+    "SVK": ["Slovakia"],
+    "KGZ": ["Kyrgyzstan"],
+    "TUR": ["Turkey", "Turki"],
+    "SYR": ["Syria", "Suriah"],
+    "VEN": ["Venezuela"],
+    "YEM": ["Yemen", "Yaman"],
+    "COD": ["DR Congo", "DRC", "Congo-Kinshasa"],
+    "COG": ["Congo-Brazzaville"],
+    "MKD": ["Macedonia"],
+    "SWZ": ["Swaziland"],
+    "MMR": ["Burma"],
+    "TLS": ["East Timor", "Timor Leste"],
+    "PSE": ["Palestine", "Palestina"],
+    "HKG": ["Hong Kong"],
+    "MAC": ["Macau"],
+    "CPV": ["Cape Verde"],
+    "FSM": ["Micronesia"],
+    "BRN": ["Brunei"],
+    "DEU": ["Jerman"],
+    "NLD": ["Belanda", "Holland"],
+    "JPN": ["Jepang"],
+    "SAU": ["Arab Saudi"],
+    "ARE": ["UAE", "Uni Emirat Arab"],
+}
+
+FUZZY_CUTOFF = 0.6
+FUZZY_CANDIDATES = 50
+
+
+def normalize(text: str) -> str:
+    """Huruf kecil, tanpa aksen dan tanda baca: "Côte d'Ivoire" -> "cote d ivoire"."""
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return re.sub(r"[^0-9a-z]+", " ", text.casefold()).strip()
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _auto_aliases(name: str) -> List[str]:
+    # "Korea, Rep." -> "Korea"; "Bahamas, The" -> "The Bahamas", "Bahamas"
+    if ", " not in name:
+        return []
+    head, tail = name.split(", ", 1)
+    aliases = [head]
+    if tail.lower() == "the":
+        aliases.append(f"The {head}")
+    return aliases
+
+
+class CountryIndex:
+    def __init__(self, pairs: Iterable[Tuple[str, str]]):
+        self.code_to_name: Dict[str, str] = {}
+        for name, code in pairs:
+            self.code_to_name.setdefault(code, name)
+
+        # Urut nama lalu kode, supaya entitas bernama sama tetap berurutan tetap
+        self.codes: List[str] = sorted(self.code_to_name, key=lambda c: (self.code_to_name[c], c))
+        self._position: Dict[str, int] = {c: i for i, c in enumerate(self.codes)}
+
+        # kunci ternormalisasi (nama, kode, alias) -> kode (bisa lebih dari satu)
+        self._exact: Dict[str, List[str]] = defaultdict(list)
+        for code in self.codes:
+            name = self.code_to_name[code]
+            for key in [name, code, *_auto_aliases(name), *ALIASES.get(code, [])]:
+                codes = self._exact[normalize(key)]
+                if code not in codes:
+                    codes.append(code)
+        self._exact = dict(self._exact)
+
+        # Prefix: tiap kunci + tiap akhiran per kata ("united states" -> "states")
+        prefix_keys = set()
+        for key, codes in self._exact.items():
+            words = key.split()
+            for i in range(len(words)):
+                for code in codes:
+                    prefix_keys.add((" ".join(words[i:]), self._position[code], code))
+        self._prefix: List[Tuple[str, int, str]] = sorted(prefix_keys)
+
+        self._keys: List[str] = list(self._exact)
+        self._trigram: Dict[str, List[int]] = defaultdict(list)
+        for i, key in enumerate(self._keys):
+            for tri in _trigrams(key):
+                self._trigram[tri].append(i)
+
+    # -------------------------
+    # Lookup O(1)
+    # -------------------------
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __sizeof__(self) -> int:
+        # Perkiraan untuk akuntansi ukuran di cache_manager
+        containers = [self.codes, self.code_to_name, self._position,
+                      self._exact, self._prefix, self._keys, self._trigram]
+        size = sum(sys.getsizeof(c) for c in containers)
+        size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in self._exact.items())
+        size += sum(sys.getsizeof(v) for v in self._trigram.values())
+        return size + sum(sys.getsizeof(p) for p in self._prefix)
+
+    def position(self, code: str, default: int = 0) -> int:
+        """Indeks `code` di `codes` (untuk parameter index= widget)."""
+        return self._position.get(code, default)
+
+    def lookup(self, text: str) -> Optional[str]:
+        """
+        Kode untuk nama, kode, atau alias yang persis (abaikan huruf/aksen).
+        Kalau nama dipakai beberapa entitas, yang pertama di `codes`.
+        """
+        codes = self._exact.get(normalize(text))
+        return codes[0] if codes else None
+
+    def name(self, code: str) -> str:
+        return self.code_to_name.get(code, code)
+
+    def label(self, code: str) -> str:
+        """Label widget, mis. "Indonesia (IDN)"; membedakan nama kembar."""
+        name = self.code_to_name.get(code)
+        return f"{name} ({code})" if name is not None else code
+
+    def sorted_subset(self, codes: Iterable[str]) -> List[str]:
+        """Urutkan sebagian kode memakai posisi yang sudah dihitung."""
+        return sorted(set(codes), key=lambda c: self._position.get(c, len(self.codes)))
+
+    # -------------------------
+    # Pencarian
+    # -------------------------
+    def search(self, text: str, limit: int = 10) -> List[str]:
+        """
+        Kode entitas yang cocok, urut: persis, prefix (awal kata), lalu fuzzy.
+        """
+        q = normalize(text)
+        if not q:
+            return []
+
+        codes: List[str] = []
+        seen: Set[str] = set()
+
+        def add(code: str) -> None:
+            if code not in seen:
+                seen.add(code)
+                codes.append(code)
+
+        for code in self._exact.get(q, ()):
+            add(code)
+
+        i = bisect.bisect_left(self._prefix, (q,))
+        while i < len(self._prefix) and self._prefix[i][0].startswith(q) and len(codes) < limit:
+            add(self._prefix[i][2])
+            i += 1
+
+        if len(codes) < limit:
+            for code in self._fuzzy(q):
+                add(code)
+
+        return codes[:limit]
+
+    def _fuzzy(self, q: str) -> List[str]:
+        # Kandidat = kunci dengan trigram bersama terbanyak, lalu diurutkan
+        # ulang dengan rasio kemiripan difflib
+        counts: Dict[int, int] = defaultdict(int)
+        for tri in _trigrams(q):
+            for i in self._trigram.get(tri, ()):
+                counts[i] += 1
+        candidates = sorted(counts, key=counts.get, reverse=True)[:FUZZY_CANDIDATES]
+
+        scored = []
+        for i in candidates:
+            key = self._keys[i]
+            ratio = difflib.SequenceMatcher(None, q, key).ratio()
+            if ratio >= FUZZY_CUTOFF:
+                scored.extend((ratio, self._position[c], c) for c in self._exact[key])
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [code for _, _, code in scored]
+
+
+def build_country_index() -> CountryIndex:
+    pairs = query(columns=["country", "country_code"]).drop_duplicates()
+    return CountryIndex(zip(pairs["country"], pairs["country_code"]))
+
+
+def get_country_index() -> CountryIndex:
+    """Indeks negara untuk versi data saat ini (dibangun sekali, lalu di-cache)."""
+    return get_cache().get_or_compute(
+        "query", ("country_index", data_version()), build_country_index
+    )
@@ -0,0 +1,462 @@
+"""
+Lapisan data bersama untuk semua halaman dashboard.
+
+File CSV World Bank (separator ; dan desimal ,) divalidasi dan dikonversi
+sekali ke store Parquet di `data/.store/` dengan format wide:
+country | country_code | 1995 | 1996 | ... | 2023
+Sel yang gagal validasi dicatat di laporan karantina di samping file
+Parquet-nya (lihat `validation.py` dan `quarantine_report`). Store dibangun
+ulang kalau CSV-nya lebih baru atau `STORE_FORMAT` (aturan validasi) berubah.
+
+Halaman cukup memanggil `query(...)`. Filter tahun/kolom dipakai sebagai
+projection (hanya kolom tahun yang diminta yang dibaca), sedangkan filter
+negara/indikator dipakai sebagai predicate yang diteruskan ke pembaca
+Parquet, sehingga row group yang tidak relevan dilewati.
+
+Hasil query di-cache di namespace "query" pada `cache_manager`, dengan key
+yang memuat `data_version()`; begitu store dibangun ulang, key lama tidak
+terpakai lagi dan akhirnya dibuang oleh eviction. DataFrame hasil query
+dipakai bersama, jadi jangan diubah in-place.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as pads
+import pyarrow.parquet as pq
+
+from cache_manager import get_cache
+from validation import QUARANTINE_COLUMNS, SchemaError, empty_quarantine, validate_wb_frame
+
+# =========================
+# KONFIGURASI
+# =========================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+STORE_DIR = os.path.join(DATA_DIR, ".store")
+LOCK_FILE = os.path.join(STORE_DIR, ".build.lock")
+
+# Label indikator -> nama file CSV sumber
+INDICATOR_FILES: Dict[str, str] = {
+    "Female LFP": "FLFP.csv",
+    "Female Secondary Enrolment": "FEMALE SECONDARY.csv",
+    "Maternal Mortality": "MATERNAL MORTALITY.csv",
+}
+
+# Rentang tahun yang dipakai (menyesuaikan maternal mortality, max 2023)
+YEAR_MIN = 1995
+YEAR_MAX = 2023
+
+LONG_COLUMNS = ["country", "country_code", "year", "value", "indicator"]
+ID_COLUMNS = ["country", "country_code"]
+
+# Baris per row group; data diurutkan per country_code supaya statistik
+# min/max tiap row group bisa dipakai untuk melewati row group lain.
+ROW_GROUP_SIZE = 32
+
+# Jumlah baris wide (negara) per potongan saat streaming export
+DEFAULT_BATCH_SIZE = 64
+
+# Naikkan kalau aturan validasi/parsing (validation.py) atau layout store
+# berubah, supaya store yang sudah ada dibangun ulang walaupun CSV-nya sama
+STORE_FORMAT = 1
+FORMAT_METADATA_KEY = b"store_format"
+
+
+# =========================
+# KONVERSI CSV -> STORE
+# =========================
+def read_wb_csv(filename: str, indicator: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Membaca satu file CSV World Bank ke format wide, sekaligus validasi.
+    Kolom tahun dinormalisasi menjadi 4 digit ("1995 [YR1995]" -> "1995")
+    dan hanya tahun dalam rentang YEAR_MIN..YEAR_MAX yang disimpan.
+    Mengembalikan (wide, laporan karantina); lihat `validation`.
+    """
+    path = os.path.join(DATA_DIR, filename)
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File tidak ditemukan: {path}")
+
+    # Dibaca sebagai teks; konversi angka dilakukan oleh validasi
+    raw = pd.read_csv(
+        path,
+        sep=";",
+        engine="python",
+        dtype=str,
+        keep_default_na=False,
+    )
+
+    wide, quarantine = validate_wb_frame(raw, indicator, filename, YEAR_MIN, YEAR_MAX)
+    return wide.sort_values("country_code").reset_index(drop=True), quarantine
+
+
+def _store_path(indicator: str) -> str:
+    return os.path.join(STORE_DIR, INDICATOR_FILES[indicator].rsplit(".", 1)[0] + ".parquet")
+
+
+def _quarantine_path(indicator: str) -> str:
+    return os.path.join(
+        STORE_DIR, INDICATOR_FILES[indicator].rsplit(".", 1)[0] + ".quarantine.parquet"
+    )
+
+
+# Penanda build yang formatnya sudah dicek: path -> (mtime_ns, STORE_FORMAT)
+_FORMAT_CHECKED: Dict[str, Tuple[int, int]] = {}
+
+
+def _has_current_format(marker: str) -> bool:
+    # Metadata dibaca sekali per versi file penanda, bukan di setiap query
+    checked = (os.stat(marker).st_mtime_ns, STORE_FORMAT)
+    if _FORMAT_CHECKED.get(marker) == checked:
+        return True
+    metadata = pq.read_schema(marker).metadata or {}
+    if metadata.get(FORMAT_METADATA_KEY) != str(STORE_FORMAT).encode():
+        return False
+    _FORMAT_CHECKED[marker] = checked
+    return True
+
+
+def _is_stale(indicator: str) -> bool:
+    # Laporan karantina selalu ditulis setiap build (juga saat file gagal
+    # dibaca), jadi dipakai sebagai penanda waktu build terakhir dan
+    # STORE_FORMAT yang dipakai
+    src = os.path.join(DATA_DIR, INDICATOR_FILES[indicator])
+    marker = _quarantine_path(indicator)
+    if not os.path.exists(marker) or not _has_current_format(marker):
+        return True
+    return os.path.exists(src) and os.path.getmtime(src) > os.path.getmtime(marker)
+
+
+def _write_parquet(df: pd.DataFrame, dst: str, **kwargs) -> None:
+    # Nama sementara unik per penulis, supaya penulis lain tidak saling timpa
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(dst), suffix=".tmp")
+    os.close(fd)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), FORMAT_METADATA_KEY: str(STORE_FORMAT).encode()}
+    )
+    try:
+        pq.write_table(table, tmp, **kwargs)
+        os.replace(tmp, dst)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+# Build dijalankan satu per satu: antar thread (sesi Streamlit, prefetch,
+# server API) lewat lock modul, antar proses (snapshot builder, API) lewat
+# lock file di STORE_DIR
+_BUILD_LOCK = threading.Lock()
+
+
+@contextmanager
+def _store_lock():
+    with _BUILD_LOCK:
+        os.makedirs(STORE_DIR, exist_ok=True)
+        with open(LOCK_FILE, "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def build_store(force: bool = False) -> List[str]:
+    """
+    Mengonversi CSV yang berubah (atau belum ada di store) ke Parquet,
+    beserta laporan karantinanya. Mengembalikan daftar indikator yang
+    ditulis ulang. Aman dipanggil dari banyak thread/proses sekaligus:
+    pemanggil berikutnya menunggu lalu melewati indikator yang sudah
+    dibangun.
+    """
+    with _store_lock():
+        return _build_store(force)
+
+
+def _build_store(force: bool) -> List[str]:
+    rebuilt = []
+
+    for indicator in INDICATOR_FILES:
+        if not force and not _is_stale(indicator):
+            continue
+        filename = INDICATOR_FILES[indicator]
+        try:
+            wide, quarantine = read_wb_csv(filename, indicator)
+        except (FileNotFoundError, SchemaError) as exc:
+            # Store lama (kalau ada) tetap dipakai; masalahnya dicatat
+            quarantine = pd.DataFrame(
+                [[indicator, filename, 0, "", "", str(exc), "schema"]],
+                columns=QUARANTINE_COLUMNS,
+            )
+            _write_parquet(quarantine, _quarantine_path(indicator))
+            continue
+
+        _write_parquet(wide, _store_path(indicator), row_group_size=ROW_GROUP_SIZE)
+        _write_parquet(quarantine, _quarantine_path(indicator))
+        rebuilt.append(indicator)
+
+    return rebuilt
+
+
+def _ensure_store() -> None:
+    # Cek cepat tanpa lock; build_store memeriksa ulang setelah dapat lock
+    if any(_is_stale(ind) for ind in INDICATOR_FILES):
+        build_store()
+
+
+# =========================
+# METADATA (tanpa membaca data)
+# =========================
+def available_indicators() -> List[str]:
+    _ensure_store()
+    return [ind for ind in INDICATOR_FILES if os.path.exists(_store_path(ind))]
+
+
+def data_version() -> str:
+    """
+    Hash pendek dari isi store (mtime + ukuran tiap file Parquet, termasuk
+    laporan karantina: build yang gagal schema hanya menulis ulang laporan).
+    """
+    h = hashlib.sha1()
+    _ensure_store()
+    for indicator in INDICATOR_FILES:
+        for path in (_store_path(indicator), _quarantine_path(indicator)):
+            if os.path.exists(path):
+                info = os.stat(path)
+                h.update(f"{os.path.basename(path)}:{info.st_mtime_ns}:{info.st_size};".encode())
+    return h.hexdigest()[:12]
+
+
+def _key(*parts) -> tuple:
+    # Argumen iterable dinormalisasi jadi tuple supaya bisa di-hash
+    return (data_version(),) + tuple(
+        None if p is None else tuple(p) if not isinstance(p, str) else p
+        for p in parts
+    )
+
+
+def _schema_names(indicator: str) -> List[str]:
+    return get_cache().get_or_compute(
+        "query",
+        _key("schema", indicator),
+        lambda: pq.read_schema(_store_path(indicator)).names,
+    )
+
+
+def available_years(indicators: Optional[Iterable[str]] = None) -> List[int]:
+    """Tahun yang tersedia, dibaca dari schema Parquet saja."""
+    years = set()
+    for indicator in _resolve_indicators(indicators):
+        years.update(int(name) for name in _schema_names(indicator) if name.isdigit())
+    return sorted(years)
+
+
+def quarantine_report(indicators: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Sel/baris yang dikarantina saat ingest (disimpan bersama store)."""
+    _ensure_store()
+    indicators = list(INDICATOR_FILES) if indicators is None else list(indicators)
+
+    def compute():
+        frames = [
+            pd.read_parquet(_quarantine_path(ind))
+            for ind in indicators
+            if ind in INDICATOR_FILES and os.path.exists(_quarantine_path(ind))
+        ]
+        frames = [f for f in frames if not f.empty]
+        return pd.concat(frames, ignore_index=True) if frames else empty_quarantine()
+
+    return get_cache().get_or_compute("query", _key("quarantine", indicators), compute)
+
+
+def list_countries(indicators: Optional[Iterable[str]] = None) -> List[str]:
+    """Daftar nama negara yang memiliki minimal satu nilai."""
+    indicators = None if indicators is None else list(indicators)
+
+    def compute():
+        df = query(indicators=indicators, columns=["country"])
+        return sorted(df["country"].unique())
+
+    return get_cache().get_or_compute("query", _key("countries", indicators), compute)
+
+
+# =========================
+# QUERY
+# =========================
+def _resolve_indicators(indicators: Optional[Iterable[str]]) -> List[str]:
+    available = available_indicators()
+    if indicators is None:
+        return available
+    return [ind for ind in indicators if ind in available]
+
+
+def _country_filter(countries: Optional[List[str]]):
+    # Negara bisa dipilih lewat nama maupun kode ISO3 (bentuk DNF: OR)
+    if countries is None:
+        return None
+    return [
+        [("country", "in", countries)],
+        [("country_code", "in", countries)],
+    ]
+
+
+def query(
+    indicators: Optional[Iterable[str]] = None,
+    years: Optional[Iterable[int]] = None,
+    countries: Optional[Iterable[str]] = None,
+    columns: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """
+    Mengambil data dalam long format:
+    country | country_code | year | value | indicator
+
+    - indicators: label indikator (default semua)
+    - years: tahun yang dibaca (default YEAR_MIN..YEAR_MAX)
+    - countries: nama atau kode negara (default semua)
+    - columns: kolom output yang dibutuhkan (default semua LONG_COLUMNS)
+
+    Baris tanpa nilai dibuang, sama seperti loader lama.
+    """
+    indicators = None if indicators is None else list(indicators)
+    years = None if years is None else sorted({int(y) for y in years})
+    countries = None if countries is None else list(countries)
+    columns = None if columns is None else list(columns)
+
+    return get_cache().get_or_compute(
+        "query",
+        _key("query", indicators, years, countries, columns),
+        lambda: _read(indicators, years, countries, columns),
+    )
+
+
+def _year_columns(indicator: str, years: Optional[List[int]]) -> List[str]:
+    year_keys = None if years is None else {str(y) for y in years}
+    return [
+        name for name in _schema_names(indicator)
+        if name.isdigit() and (year_keys is None or name in year_keys)
+    ]
+
+
+def _to_long(
+    wide: pd.DataFrame,
+    id_cols: List[str],
+    year_cols: List[str],
+    indicator: str,
+    out_cols: List[str],
+) -> pd.DataFrame:
+    # Wide (satu kolom per tahun) -> long, buang baris tanpa nilai
+    if id_cols:
+        df_long = wide.melt(
+            id_vars=id_cols,
+            value_vars=year_cols,
+            var_name="year",
+            value_name="value",
+        )
+    else:
+        df_long = wide.melt(value_vars=year_cols, var_name="year", value_name="value")
+
+    df_long = df_long.dropna(subset=["value"])
+    df_long["year"] = df_long["year"].astype("int64")
+    df_long["indicator"] = indicator
+    return df_long[out_cols]
+
+
+def _read(
+    indicators: Optional[List[str]],
+    years: Optional[List[int]],
+    countries: Optional[List[str]],
+    columns: Optional[List[str]],
+) -> pd.DataFrame:
+    out_cols = LONG_COLUMNS if columns is None else [c for c in LONG_COLUMNS if c in columns]
+
+    if countries is not None and not countries:
+        return pd.DataFrame(columns=out_cols)
+
+    filters = _country_filter(countries)
+
+    id_cols = [c for c in ID_COLUMNS if c in out_cols]
+    frames = []
+
+    for indicator in _resolve_indicators(indicators):
+        year_cols = _year_columns(indicator, years)
+        if not year_cols:
+            continue
+
+        table = pq.read_table(
+            _store_path(indicator), columns=id_cols + year_cols, filters=filters
+        )
+        if table.num_rows == 0:
+            continue
+
+        frames.append(_to_long(table.to_pandas(), id_cols, year_cols, indicator, out_cols))
+
+    if not frames:
+        return pd.DataFrame(columns=out_cols)
+
+    return pd.concat(frames, ignore_index=True)
+
+
+# =========================
+# STREAMING (untuk export)
+# =========================
+def iter_batches(
+    indicators: Optional[Iterable[str]] = None,
+    years: Optional[Iterable[int]] = None,
+    countries: Optional[Iterable[str]] = None,
+    columns: Optional[Iterable[str]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[pd.DataFrame]:
+    """
+    Sama seperti `query`, tetapi hasilnya dialirkan per potongan
+    (maks. `batch_size` negara per indikator) tanpa membentuk seluruh
+    panel di memori. Hasilnya tidak di-cache.
+    """
+    indicators = None if indicators is None else list(indicators)
+    years = None if years is None else sorted({int(y) for y in years})
+    countries = None if countries is None else list(countries)
+    out_cols = LONG_COLUMNS if columns is None else [c for c in LONG_COLUMNS if c in columns]
+
+    if countries is not None and not countries:
+        return
+
+    expr = None
+    if countries is not None:
+        expr = pc.field("country").isin(countries) | pc.field("country_code").isin(countries)
+
+    id_cols = [c for c in ID_COLUMNS if c in out_cols]
+
+    for indicator in _resolve_indicators(indicators):
+        year_cols = _year_columns(indicator, years)
+        if not year_cols:
+            continue
+
+        dataset = pads.dataset(_store_path(indicator), format="parquet")
+        for batch in dataset.to_batches(
+            columns=id_cols + year_cols, filter=expr, batch_size=batch_size
+        ):
+            if batch.num_rows == 0:
+                continue
+            df_long = _to_long(batch.to_pandas(), id_cols, year_cols, indicator, out_cols)
+            if not df_long.empty:
+                yield df_long
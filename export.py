@@ -0,0 +1,153 @@
+"""
+Export data terpilih dalam bentuk CSV atau Parquet secara streaming.
+
+Data diambil dari `data_store.iter_batches` potong demi potong dan langsung
+ditulis ke tujuan, sehingga pemakaian memori tetap kecil berapa pun jumlah
+indikator/negara yang diekspor. Ini berlaku untuk CLI di bawah dan endpoint
+`/api/export` di `api_server.py`.
+
+Tombol unduh di halaman Streamlit TIDAK streaming: Streamlit menyimpan
+seluruh isi file di memori sebelum dikirim. Karena itu halaman hanya
+menawarkan potongan kecil (satu tahun / satu negara / satu indikator-tahun,
+lihat `export_bytes`); export besar lewat CLI atau `/api/export`.
+
+Contoh CLI:
+    python export.py --format csv --indicator "Female LFP" --year 2020 -o lfp_2020.csv
+    python export.py --format parquet -o semua.parquet
+"""
+import argparse
+import io
+import sys
+from typing import BinaryIO, Iterable, Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from data_store import DEFAULT_BATCH_SIZE, LONG_COLUMNS, iter_batches
+
+FORMATS = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+ARROW_TYPES = {
+    "country": pa.string(),
+    "country_code": pa.string(),
+    "year": pa.int64(),
+    "value": pa.float64(),
+    "indicator": pa.string(),
+}
+
+
+def _out_columns(columns: Optional[Iterable[str]]) -> List[str]:
+    return LONG_COLUMNS if columns is None else [c for c in LONG_COLUMNS if c in columns]
+
+
+def iter_csv_chunks(
+    indicators: Optional[Iterable[str]] = None,
+    years: Optional[Iterable[int]] = None,
+    countries: Optional[Iterable[str]] = None,
+    columns: Optional[Iterable[str]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[bytes]:
+    """Potongan CSV (bytes); header hanya di potongan pertama."""
+    out_cols = _out_columns(columns)
+    yield (",".join(out_cols) + "\n").encode("utf-8")
+
+    for batch in iter_batches(indicators, years, countries, out_cols, batch_size):
+        yield batch.to_csv(index=False, header=False).encode("utf-8")
+
+
+def write_parquet(
+    sink: BinaryIO,
+    indicators: Optional[Iterable[str]] = None,
+    years: Optional[Iterable[int]] = None,
+    countries: Optional[Iterable[str]] = None,
+    columns: Optional[Iterable[str]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """Tulis Parquet per potongan (satu row group per potongan). Mengembalikan jumlah baris."""
+    out_cols = _out_columns(columns)
+    schema = pa.schema([(c, ARROW_TYPES[c]) for c in out_cols])
+    rows = 0
+
+    with pq.ParquetWriter(sink, schema) as writer:
+        for batch in iter_batches(indicators, years, countries, out_cols, batch_size):
+            writer.write_table(pa.Table.from_pandas(batch, schema=schema, preserve_index=False))
+            rows += len(batch)
+
+    return rows
+
+
+def write_export(fmt: str, sink: BinaryIO, **selection) -> None:
+    """Tulis export format `fmt` ke file biner `sink`."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Format tidak dikenal: {fmt!r} (pilih {sorted(FORMATS)})")
+
+    if fmt == "csv":
+        for chunk in iter_csv_chunks(**selection):
+            sink.write(chunk)
+    else:
+        write_parquet(sink, **selection)
+
+
+def export_bytes(fmt: str, **selection) -> bytes:
+    """
+    Export lengkap sebagai bytes, untuk callable `st.download_button`
+    (export baru dibuat saat tombol diklik). Seluruh hasil ada di memori,
+    jadi hanya untuk potongan per halaman yang kecil.
+    """
+    buffer = io.BytesIO()
+    write_export(fmt, buffer, **selection)
+    return buffer.getvalue()
+
+
+def export_filename(fmt: str, *parts) -> str:
+    """Nama file export, mis. ("Female LFP", 2020) -> "female_lfp_2020.csv"."""
+    stem = "_".join(str(p) for p in parts if p not in (None, "")) or "women_indicators"
+    stem = "".join(ch if ch.isalnum() else "_" for ch in stem.lower()).strip("_")
+    return f"{stem}.{fmt}"
+
+
+# =========================
+# CLI
+# =========================
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Export data indikator perempuan (CSV/Parquet) secara streaming."
+    )
+    parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+    parser.add_argument("--indicator", action="append", dest="indicators",
+                        help="Label indikator (boleh diulang). Default: semua.")
+    parser.add_argument("--year", action="append", dest="years", type=int,
+                        help="Tahun (boleh diulang). Default: semua.")
+    parser.add_argument("--country", action="append", dest="countries",
+                        help="Nama atau kode ISO3 negara (boleh diulang). Default: semua.")
+    parser.add_argument("--columns", nargs="+", choices=LONG_COLUMNS,
+                        help="Kolom yang diekspor. Default: semua.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("-o", "--output",
+                        help="File tujuan. Default: stdout (hanya untuk CSV).")
+    args = parser.parse_args(argv)
+
+    selection = dict(
+        indicators=args.indicators,
+        years=args.years,
+        countries=args.countries,
+        columns=args.columns,
+        batch_size=args.batch_size,
+    )
+
+    if args.output is None:
+        if args.format != "csv":
+            parser.error("Format parquet butuh --output")
+        write_export(args.format, sys.stdout.buffer, **selection)
+        return 0
+
+    with open(args.output, "wb") as sink:
+        write_export(args.format, sink, **selection)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
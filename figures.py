@@ -0,0 +1,43 @@
+"""
+Pembuat grafik plotly yang dipakai halaman dashboard dan snapshot statis,
+supaya tampilan grafik di keduanya selalu sama.
+"""
+from typing import Dict
+
+import pandas as pd
+import plotly.express as px
+
+# Label indikator untuk grafik ranking (Overview & Comparison)
+RANKING_LABELS: Dict[str, str] = {
+    "Female LFP": "Female Labor Force Participation (%)",
+    "Female Secondary Enrolment": "Female Secondary Enrolment (%)",
+    "Maternal Mortality": "Maternal Mortality (per 100.000 births)",
+}
+
+# Label indikator untuk grafik tren (Country Profile)
+TREND_LABELS: Dict[str, str] = {
+    "Female LFP": "Female Labor Force Participation (%)",
+    "Female Secondary Enrolment": "Female Secondary Enrolment (%)",
+    "Maternal Mortality": "Maternal Mortality (per 100.000 kelahiran)",
+}
+
+
+def ranking_bar(df: pd.DataFrame, label: str):
+    """Grafik batang nilai per negara (kolom country | value)."""
+    return px.bar(
+        df,
+        x="country",
+        y="value",
+        labels={"country": "Negara", "value": label},
+    )
+
+
+def trend_line(df: pd.DataFrame, label: str):
+    """Grafik garis nilai per tahun (kolom year | value)."""
+    return px.line(
+        df,
+        x="year",
+        y="value",
+        markers=True,
+        labels={"year": "Tahun", "value": label},
+    )
@@ -1,9 +1,14 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import os
 from typing import Dict
 
+from aggregates import global_summary, top_bottom
+from cache_manager import get_cache
+from data_store import available_years, data_version, quarantine_report
+from export import FORMATS, export_bytes, export_filename
+from figures import RANKING_LABELS, ranking_bar
+from prefetch import get_prefetcher, neighbour_years
+from validation import summarize
+
 def apply_pink_theme():
     st.markdown(
         """
@@ -46,87 +51,26 @@ def apply_pink_theme():
 
 apply_pink_theme()
 
-# =========================
-# KONFIGURASI FILE DATA
-# =========================
-FEMALE_EDU_FILE = "FEMALE SECONDARY.csv"
-FEMALE_LFP_FILE = "FLFP.csv"
-MATERNAL_MORT_FILE = "MATERNAL MORTALITY.csv"
-
-
 # =========================
 # FUNGSI BACA DATA
 # =========================
-def load_wb_indicator(filename: str, indicator_label: str) -> pd.DataFrame:
+def build_rankings(year: int, indicator: str, label: str):
     """
-    Membaca file CSV World Bank versi kamu:
-    - Separator ; (semicolon)
-    - Desimal , (comma)
-    Lalu ubah ke long format:
-    country | country_code | year | value | indicator
+    Top 10 / Bottom 10 negara untuk satu indikator dan tahun,
+    beserta grafiknya (None kalau tidak ada data).
     """
-    path = os.path.join("data", filename)
-
-    if not os.path.exists(path):
-        st.error(f"File tidak ditemukan: {path}")
-        return pd.DataFrame(columns=["country", "country_code", "year", "value", "indicator"])
-
-    # Baca CSV
-    df = pd.read_csv(
-        path,
-        sep=";",       # penting, karena file kamu pakai ;
-        engine="python",
-        decimal=",",   # angka desimal pakai koma
-    )
-
-    # Deteksi kolom tahun: kolom yang diawali angka (misal "1990", "1990 [YR1990]")
-    year_cols = [
-        c for c in df.columns
-        if str(c).strip()[:4].isdigit()
-    ]
-
-    if "Country Name" not in df.columns or "Country Code" not in df.columns:
-        st.error(f"Kolom 'Country Name' / 'Country Code' tidak ditemukan di {filename}")
-        return pd.DataFrame(columns=["country", "country_code", "year", "value", "indicator"])
-
-    df_long = df.melt(
-        id_vars=["Country Name", "Country Code"],
-        value_vars=year_cols,
-        var_name="year",
-        value_name="value",
-    )
+    # untuk mortality, nilai rendah = lebih baik (diatur di aggregates)
+    top10, bottom10 = top_bottom(indicator, year, n=10)
 
-    # Bersihkan kolom tahun (ambil 4 digit pertama)
-    df_long["year"] = df_long["year"].astype(str).str.slice(0, 4)
-    df_long["year"] = pd.to_numeric(df_long["year"], errors="coerce")
-    df_long["value"] = pd.to_numeric(df_long["value"], errors="coerce")
-
-    df_long["indicator"] = indicator_label
-    df_long = df_long.rename(
-        columns={"Country Name": "country", "Country Code": "country_code"}
-    )
-
-    # Buang baris tanpa tahun atau nilai
-    df_long = df_long.dropna(subset=["year", "value"])
-
-    return df_long
+    fig_top = ranking_bar(top10, label) if not top10.empty else None
+    fig_bottom = ranking_bar(bottom10, label) if not bottom10.empty else None
 
+    return top10, bottom10, fig_top, fig_bottom
 
-@st.cache_data
-def load_all_data() -> pd.DataFrame:
-    lfp = load_wb_indicator(FEMALE_LFP_FILE, "Female LFP")
-    edu = load_wb_indicator(FEMALE_EDU_FILE, "Female Secondary Enrolment")
-    mort = load_wb_indicator(MATERNAL_MORT_FILE, "Maternal Mortality")
 
-    all_df = pd.concat([lfp, edu, mort], ignore_index=True)
-
-    if all_df.empty:
-        return all_df
-
-    # Batasi tahun yang dipakai supaya konsisten (menyesuaikan maternal mortality, max 2023)
-    all_df = all_df[(all_df["year"] >= 1995) & (all_df["year"] <= 2023)]
-
-    return all_df
+prefetcher = get_prefetcher()
+# Awalan key cache halaman, supaya hasil lama tidak terpakai setelah data berubah
+version = data_version()
 
 
 # =========================
@@ -134,36 +78,37 @@ def load_all_data() -> pd.DataFrame:
 # =========================
 st.title("Overview – Women & Development")
 
-df = load_all_data()
+years = available_years()
 
 # Kalau data benar-benar kosong
-if df.empty:
+if not years:
     st.error("Dataset kosong atau tidak berhasil dibaca. Periksa file di folder `data/`.")
     st.stop()
 
-available_years = sorted(df["year"].unique())
-
-if not available_years:
-    st.error("Tidak ada tahun yang tersedia dalam data.")
-    st.stop()
-
-default_year = max(available_years)
+default_year = max(years)
 
 selected_year = st.sidebar.selectbox(
     "Pilih Tahun",
-    options=available_years,
-    index=available_years.index(default_year),
+    options=years,
+    index=years.index(default_year),
 )
 
-df_year = df[df["year"] == selected_year]
+# Unduh semua indikator untuk tahun terpilih (dibuat saat tombol diklik)
+export_format = st.sidebar.radio("Format unduhan", options=list(FORMATS), horizontal=True)
+st.sidebar.download_button(
+    "Unduh data tahun ini",
+    data=lambda: export_bytes(export_format, years=[selected_year]),
+    file_name=export_filename(export_format, "overview", selected_year),
+    mime=FORMATS[export_format],
+)
 
 st.subheader(f"Ringkasan Global Indikator Perempuan – {selected_year}")
 
 # Ringkasan global per indikator
-summary = (
-    df_year.groupby("indicator")["value"]
-    .agg(["mean", "min", "max"])
-    .reset_index()
+summary = prefetcher.get(
+    "tables",
+    (version, "overview_summary", selected_year),
+    lambda: global_summary(selected_year),
 )
 
 col1, col2, col3 = st.columns(3)
@@ -201,9 +146,7 @@ else:
 st.markdown("---")
 
 indicator_labels: Dict[str, str] = {
-    "Female Labor Force Participation (%)": "Female LFP",
-    "Female Secondary Enrolment (%)": "Female Secondary Enrolment",
-    "Maternal Mortality (per 100.000 births)": "Maternal Mortality",
+    label: indicator for indicator, label in RANKING_LABELS.items()
 }
 
 chosen_label = st.selectbox(
@@ -213,7 +156,11 @@ chosen_label = st.selectbox(
 
 chosen_indicator = indicator_labels[chosen_label]
 
-df_ind = df_year[df_year["indicator"] == chosen_indicator].copy()
+top10, bottom10, fig_top, fig_bottom = prefetcher.get(
+    "figures",
+    (version, "overview_rankings", selected_year, chosen_indicator),
+    lambda: build_rankings(selected_year, chosen_indicator, chosen_label),
+)
 
 st.markdown(f"Distribusi Negara – {chosen_label}")
 
@@ -221,37 +168,50 @@ col_left, col_right = st.columns(2)
 
 with col_left:
     st.markdown("Top 10 Negara")
-    if chosen_indicator == "Maternal Mortality":
-        # untuk mortality, nilai rendah = lebih baik
-        top10 = df_ind.sort_values("value", ascending=True).head(10)
-    else:
-        top10 = df_ind.sort_values("value", ascending=False).head(10)
-
-    if not top10.empty:
-        fig_top = px.bar(
-            top10,
-            x="country",
-            y="value",
-            labels={"country": "Negara", "value": chosen_label},
-        )
+    if fig_top is not None:
         st.plotly_chart(fig_top, use_container_width=True, key="top_chart")
     else:
         st.info("Tidak ada data untuk ditampilkan.")
 
 with col_right:
     st.markdown("Bottom 10 Negara")
-    if chosen_indicator == "Maternal Mortality":
-        bottom10 = df_ind.sort_values("value", ascending=False).head(10)
-    else:
-        bottom10 = df_ind.sort_values("value", ascending=True).head(10)
-
-    if not bottom10.empty:
-        fig_bottom = px.bar(
-            bottom10,
-            x="country",
-            y="value",
-            labels={"country": "Negara", "value": chosen_label},
-        )
+    if fig_bottom is not None:
         st.plotly_chart(fig_bottom, use_container_width=True, key="bottom_chart")
     else:
         st.info("Tidak ada data untuk ditampilkan.")
+
+# =========================
+# PREFETCH PILIHAN BERIKUTNYA
+# =========================
+# Tahun tetangga (indikator yang sama) dan indikator lain (tahun yang sama)
+for year in neighbour_years(years, selected_year):
+    prefetcher.prefetch(
+        "tables",
+        (version, "overview_summary", year),
+        lambda y=year: global_summary(y),
+    )
+    prefetcher.prefetch(
+        "figures",
+        (version, "overview_rankings", year, chosen_indicator),
+        lambda y=year: build_rankings(y, chosen_indicator, chosen_label),
+    )
+
+for label, indicator in indicator_labels.items():
+    if indicator == chosen_indicator:
+        continue
+    prefetcher.prefetch(
+        "figures",
+        (version, "overview_rankings", selected_year, indicator),
+        lambda i=indicator, lbl=label: build_rankings(selected_year, i, lbl),
+    )
+
+with st.sidebar.expander("Statistik cache"):
+    st.json({"prefetch": prefetcher.stats(), "cache": get_cache().stats()})
+
+# Sel yang dibuang saat validasi ingest (lihat validation.py)
+quarantine = quarantine_report()
+with st.sidebar.expander(f"Data dikarantina ({len(quarantine)})"):
+    if quarantine.empty:
+        st.caption("Semua sel lolos validasi.")
+    else:
+        st.dataframe(summarize(quarantine), use_container_width=True)
@@ -1,7 +1,13 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import os
+
+from aggregates import LOWER_IS_BETTER, rank_countries
+from cache_manager import get_cache
+from country_index import get_country_index
+from data_store import available_years, data_version, query
+from export import FORMATS, export_bytes, export_filename
+from figures import RANKING_LABELS, ranking_bar
+from prefetch import get_prefetcher, neighbour_years
 
 # =========================
 # TEMA PINK
@@ -48,84 +54,38 @@ def apply_pink_theme():
 
 apply_pink_theme()
 
-# =========================
-# KONFIGURASI FILE DATA
-# =========================
-FEMALE_EDU_FILE = "FEMALE SECONDARY.csv"
-FEMALE_LFP_FILE = "FLFP.csv"
-MATERNAL_MORT_FILE = "MATERNAL MORTALITY.csv"
-
-
 # =========================
 # FUNGSI BACA DATA
 # =========================
-def load_wb_indicator(filename: str, indicator_label: str) -> pd.DataFrame:
-    """
-    Baca file CSV World Bank versi kamu:
-    - separator ; (semicolon)
-    - desimal , (comma)
-    Ubah ke long format:
-    country | country_code | year | value | indicator
-    """
-    path = os.path.join("data", filename)
-
-    if not os.path.exists(path):
-        st.error(f"File tidak ditemukan: {path}")
-        return pd.DataFrame(columns=["country", "country_code", "year", "value", "indicator"])
-
-    df = pd.read_csv(
-        path,
-        sep=";",
-        engine="python",
-        decimal=",",
-    )
-
-    # Kolom tahun = kolom yang diawali 4 digit angka
-    year_cols = [
-        c for c in df.columns
-        if str(c).strip()[:4].isdigit()
-    ]
-
-    if "Country Name" not in df.columns or "Country Code" not in df.columns:
-        st.error(f"Kolom 'Country Name' / 'Country Code' tidak ditemukan di {filename}")
-        return pd.DataFrame(columns=["country", "country_code", "year", "value", "indicator"])
-
-    df_long = df.melt(
-        id_vars=["Country Name", "Country Code"],
-        value_vars=year_cols,
-        var_name="year",
-        value_name="value",
-    )
-
-    df_long["year"] = df_long["year"].astype(str).str.slice(0, 4)
-    df_long["year"] = pd.to_numeric(df_long["year"], errors="coerce")
-    df_long["value"] = pd.to_numeric(df_long["value"], errors="coerce")
-
-    df_long["indicator"] = indicator_label
-    df_long = df_long.rename(
-        columns={"Country Name": "country", "Country Code": "country_code"}
+def load_indicator_year(indicator: str, year: int) -> pd.DataFrame:
+    # Cukup satu indikator dan satu kolom tahun
+    return query(
+        indicators=[indicator], years=[year], columns=["country", "country_code", "value"]
     )
 
-    df_long = df_long.dropna(subset=["year", "value"])
 
-    return df_long
+def default_top_n(n_countries: int) -> int:
+    # Nilai awal slider jumlah negara
+    if n_countries <= 5:
+        return n_countries
+    return min(20, min(50, n_countries))
 
 
-@st.cache_data
-def load_all_data() -> pd.DataFrame:
-    lfp = load_wb_indicator(FEMALE_LFP_FILE, "Female LFP")
-    edu = load_wb_indicator(FEMALE_EDU_FILE, "Female Secondary Enrolment")
-    mort = load_wb_indicator(MATERNAL_MORT_FILE, "Maternal Mortality")
+def build_chart(df_year: pd.DataFrame, indicator: str, label: str, top_n: int):
+    """Urutkan sesuai jenis indikator, ambil top_n, lalu buat grafik batang."""
+    df_sorted = rank_countries(df_year, indicator, top_n)
+    return df_sorted, ranking_bar(df_sorted, label)
 
-    all_df = pd.concat([lfp, edu, mort], ignore_index=True)
 
-    if all_df.empty:
-        return all_df
+def build_default_chart(indicator: str, label: str, year: int):
+    # Tampilan awal (tanpa filter negara, slider di nilai default)
+    df_year = load_indicator_year(indicator, year)
+    return build_chart(df_year, indicator, label, default_top_n(len(df_year)))
 
-    # Samakan rentang tahun
-    all_df = all_df[(all_df["year"] >= 1995) & (all_df["year"] <= 2023)]
 
-    return all_df
+prefetcher = get_prefetcher()
+# Awalan key cache halaman, supaya hasil lama tidak terpakai setelah data berubah
+version = data_version()
 
 
 # =========================
@@ -133,32 +93,23 @@ def load_all_data() -> pd.DataFrame:
 # =========================
 st.title("Comparison between Nations – Women Indicators")
 
-df = load_all_data()
+years = available_years()
 
-if df.empty:
+if not years:
     st.error("Dataset kosong atau tidak berhasil dibaca. Periksa file di folder `data/`.")
     st.stop()
 
-available_years = sorted(df["year"].unique())
-if not available_years:
-    st.error("Tidak ada tahun yang tersedia dalam data.")
-    st.stop()
-
-default_year = max(available_years)
+default_year = max(years)
 
-indicator_options = {
-    "Female Labor Force Participation (%)": "Female LFP",
-    "Female Secondary Enrolment (%)": "Female Secondary Enrolment",
-    "Maternal Mortality (per 100.000 births)": "Maternal Mortality",
-}
+indicator_options = {label: ind for ind, label in RANKING_LABELS.items()}
 
 col1, col2 = st.columns(2)
 
 with col1:
     selected_year = st.selectbox(
         "Pilih Tahun",
-        options=available_years,
-        index=available_years.index(default_year),
+        options=years,
+        index=years.index(default_year),
     )
 
 with col2:
@@ -169,7 +120,7 @@ with col2:
 
 indicator = indicator_options[indicator_label]
 
-df_year = df[(df["year"] == selected_year) & (df["indicator"] == indicator)]
+df_year = load_indicator_year(indicator, selected_year)
 
 if df_year.empty:
     st.warning("Tidak ada data untuk kombinasi tahun dan indikator ini.")
@@ -178,14 +129,36 @@ if df_year.empty:
 st.subheader(f"Perbandingan Negara – {indicator_label} ({selected_year})")
 
 # Filter negara (opsional)
-all_countries = sorted(df_year["country"].unique())
+# Opsi (kode negara, karena nama bisa kembar) terurut per indikator/tahun
+# dihitung sekali lalu di-cache
+index = get_country_index()
+all_countries = get_cache().get_or_compute(
+    "tables",
+    (version, "comparison_countries", indicator, selected_year),
+    lambda: index.sorted_subset(df_year["country_code"]),
+)
 selected_countries = st.multiselect(
     "Filter negara tertentu (kosongkan bila ingin memakai semua negara)",
     options=all_countries,
+    format_func=index.label,
 )
 
+# Tambah negara lewat kode ISO3 / alias / nama dengan salah ketik
+extra_text = st.text_input("Tambah negara lewat kode ISO3 atau alias (pisahkan dengan koma)")
+if extra_text:
+    available = set(all_countries)
+    not_found = []
+    for token in filter(None, (t.strip() for t in extra_text.split(","))):
+        code = index.lookup(token) or next(iter(index.search(token, limit=1)), None)
+        if code in available and code not in selected_countries:
+            selected_countries.append(code)
+        elif code not in available:
+            not_found.append(token)
+    if not_found:
+        st.caption(f"Tidak ditemukan untuk tahun/indikator ini: {', '.join(not_found)}")
+
 if selected_countries:
-    df_year = df_year[df_year["country"].isin(selected_countries)]
+    df_year = df_year[df_year["country_code"].isin(selected_countries)]
 
 if df_year.empty:
     st.warning("Tidak ada data setelah filter negara diterapkan.")
@@ -204,25 +177,26 @@ else:
         "Tampilkan berapa negara di grafik",
         min_value=5,
         max_value=max_allowed,
-        value=min(20, max_allowed),
+        value=default_top_n(n_countries),
     )
 
 # Sorting sesuai jenis indikator
-if indicator == "Maternal Mortality":
-    df_sorted = df_year.sort_values("value", ascending=True).head(top_n)
+if indicator in LOWER_IS_BETTER:
     note_text = "Untuk maternal mortality, nilai yang lebih rendah berarti kinerja lebih baik."
 else:
-    df_sorted = df_year.sort_values("value", ascending=False).head(top_n)
     note_text = "Untuk indikator ini, nilai yang lebih tinggi berarti kinerja lebih baik."
 
 st.caption(note_text)
 
-fig_bar = px.bar(
-    df_sorted,
-    x="country",
-    y="value",
-    labels={"country": "Negara", "value": indicator_label},
-)
+if not selected_countries and top_n == default_top_n(n_countries):
+    # Tampilan awal: bisa sudah dihangatkan oleh prefetch
+    df_sorted, fig_bar = prefetcher.get(
+        "figures",
+        (version, "comparison_chart", indicator, selected_year),
+        lambda: build_chart(df_year, indicator, indicator_label, top_n),
+    )
+else:
+    df_sorted, fig_bar = build_chart(df_year, indicator, indicator_label, top_n)
 
 st.plotly_chart(fig_bar, use_container_width=True, key=f"bar_{indicator}_{selected_year}")
 
@@ -233,3 +207,39 @@ table = df_sorted[["country", "value"]].rename(
 )
 
 st.dataframe(table, use_container_width=True)
+
+# Unduh semua negara terpilih (bukan hanya top_n di grafik)
+export_format = st.radio("Format unduhan", options=list(FORMATS), horizontal=True)
+st.download_button(
+    "Unduh data perbandingan",
+    data=lambda: export_bytes(
+        export_format,
+        indicators=[indicator],
+        years=[selected_year],
+        countries=selected_countries or None,
+    ),
+    file_name=export_filename(export_format, indicator, selected_year),
+    mime=FORMATS[export_format],
+)
+
+# =========================
+# PREFETCH PILIHAN BERIKUTNYA
+# =========================
+# Tahun tetangga (indikator yang sama) dan indikator lain (tahun yang sama)
+next_views = [(indicator_label, indicator, y) for y in neighbour_years(years, selected_year)]
+next_views += [
+    (label, ind, selected_year)
+    for label, ind in indicator_options.items()
+    if ind != indicator
+]
+
+# Grafik default sekaligus menghangatkan cache query untuk datanya
+for label, ind, year in next_views:
+    prefetcher.prefetch(
+        "figures",
+        (version, "comparison_chart", ind, year),
+        lambda i=ind, lbl=label, y=year: build_default_chart(i, lbl, y),
+    )
+
+with st.sidebar.expander("Statistik cache"):
+    st.json({"prefetch": prefetcher.stats(), "cache": get_cache().stats()})
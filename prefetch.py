@@ -0,0 +1,192 @@
+"""
+Prefetch latar belakang untuk pilihan yang kemungkinan dibuka berikutnya.
+
+Setelah halaman selesai dirender, halaman mendaftarkan tahun tetangga dan
+indikator lain ke `Prefetcher`. Hasilnya (DataFrame / figure) dihitung di
+thread pool dan disimpan di cache terpusat (`cache_manager`). Hasil prefetch
+yang belum dipakai dibatasi memory budget sendiri, sehingga prefetch tidak
+mendesak keluar entri yang sedang dipakai halaman.
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from cache_manager import CacheManager, estimate_size, get_cache
+
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_MEMORY_BUDGET = 32 * 1024 * 1024  # 32 MB untuk hasil prefetch yang belum dipakai
+
+# Hasil _run kalau nilainya sudah ada di cache sebelum prefetch mulai
+_SKIPPED = object()
+
+
+class Prefetcher:
+    """
+    Thread pool untuk menghangatkan cache di latar belakang.
+
+    - get(namespace, key, compute): ambil dari cache, atau hitung sekarang
+    - prefetch(namespace, key, compute): jadwalkan perhitungan di thread pool
+    - stats(): hit rate dan jumlah pekerjaan prefetch yang terbuang
+    """
+
+    def __init__(
+        self,
+        cache: Optional[CacheManager] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    ):
+        self.cache = cache if cache is not None else get_cache()
+        self.memory_budget = memory_budget
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="prefetch"
+        )
+        # RLock: listener cache bisa terpanggil di thread yang sama saat
+        # _run memegang lock ini di sekitar cache.put (eviction entri lain)
+        self._lock = threading.RLock()
+        self._pending: Dict[Tuple[str, Hashable], Future] = {}
+        # Hasil prefetch yang belum pernah dipakai -> ukurannya
+        self._unused: Dict[Tuple[str, Hashable], int] = {}
+        self._unused_bytes = 0
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "prefetch_scheduled": 0,
+            "prefetch_completed": 0,
+            "prefetch_used": 0,
+            "prefetch_wasted": 0,
+            "prefetch_skipped_budget": 0,
+        }
+        self.cache.add_listener(self._on_removed)
+
+    # -------------------------
+    # Pelacakan hasil prefetch
+    # -------------------------
+    def _on_removed(self, namespace: str, key: Hashable, reason: str) -> None:
+        # Hasil prefetch dibuang cache sebelum sempat dipakai = kerja terbuang
+        with self._lock:
+            size = self._unused.pop((namespace, key), None)
+            if size is None:
+                return
+            self._unused_bytes -= size
+            if reason != "replaced":
+                self._counters["prefetch_wasted"] += 1
+
+    def _mark_used(self, full_key: Tuple[str, Hashable]) -> None:
+        with self._lock:
+            size = self._unused.pop(full_key, None)
+            if size is not None:
+                self._unused_bytes -= size
+                self._counters["prefetch_used"] += 1
+
+    # -------------------------
+    # API
+    # -------------------------
+    def get(self, namespace: str, key: Hashable, compute: Callable[[], Any]) -> Any:
+        full_key = (namespace, key)
+        missing = object()
+        value = self.cache.get(namespace, key, missing)
+        if value is not missing:
+            with self._lock:
+                self._counters["hits"] += 1
+            self._mark_used(full_key)
+            return value
+
+        with self._lock:
+            pending = self._pending.get(full_key)
+
+        # Prefetch sedang berjalan: tunggu hasilnya daripada menghitung ulang
+        if pending is not None:
+            try:
+                value = pending.result()
+            except Exception:
+                value = _SKIPPED
+            if value is _SKIPPED:
+                # Gagal, atau nilainya sudah dimasukkan pemanggil lain
+                value = self.cache.get(namespace, key, missing)
+            if value is not missing:
+                with self._lock:
+                    self._counters["hits"] += 1
+                self._mark_used(full_key)
+                return value
+
+        with self._lock:
+            self._counters["misses"] += 1
+        value = compute()
+        self.cache.put(namespace, key, value)
+        return value
+
+    def prefetch(self, namespace: str, key: Hashable, compute: Callable[[], Any]) -> None:
+        full_key = (namespace, key)
+        if self.cache.contains(namespace, key):
+            return
+        cache_full = self.cache.used_bytes >= self.cache.memory_budget
+        with self._lock:
+            if full_key in self._pending:
+                return
+            if cache_full or self._unused_bytes >= self.memory_budget:
+                self._counters["prefetch_skipped_budget"] += 1
+                return
+            self._counters["prefetch_scheduled"] += 1
+            future = self._executor.submit(self._run, full_key, compute)
+            self._pending[full_key] = future
+
+    def _run(self, full_key: Tuple[str, Hashable], compute: Callable[[], Any]) -> Any:
+        namespace, key = full_key
+        try:
+            # Halaman sudah menghitungnya sendiri sejak prefetch dijadwalkan
+            if self.cache.contains(namespace, key):
+                return _SKIPPED
+            value = compute()
+            size = estimate_size(value)
+            with self._lock:
+                self._counters["prefetch_completed"] += 1
+                if self.cache.contains(namespace, key):
+                    # Halaman lebih dulu selesai; nilai di cache dipertahankan
+                    self._counters["prefetch_wasted"] += 1
+                    return value
+                # Dicatat setelah put berhasil (listener "replaced" tidak
+                # menghapus catatan ini); lock dipegang supaya _mark_used
+                # dari get() di thread lain menunggu sampai tercatat
+                if not self.cache.put(namespace, key, value) \
+                        or not self.cache.contains(namespace, key):
+                    # Ditolak budget, atau langsung terbuang oleh eviction
+                    self._counters["prefetch_wasted"] += 1
+                    return value
+                self._unused[full_key] = size
+                self._unused_bytes += size
+            return value
+        finally:
+            with self._lock:
+                self._pending.pop(full_key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["pending"] = len(self._pending)
+            stats["unused_bytes"] = self._unused_bytes
+            stats["memory_budget"] = self.memory_budget
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+_prefetcher = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_prefetcher() -> Prefetcher:
+    """Satu Prefetcher per proses, dipakai bersama oleh semua halaman."""
+    global _prefetcher
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            _prefetcher = Prefetcher()
+        return _prefetcher
+
+
+def neighbour_years(years: list, selected: int, radius: int = 1) -> list:
+    """Tahun di kiri/kanan tahun terpilih pada daftar tahun yang tersedia."""
+    if selected not in years:
+        return []
+    i = years.index(selected)
+    lo, hi = max(0, i - radius), min(len(years), i + radius + 1)
+    return [y for y in years[lo:hi] if y != selected]
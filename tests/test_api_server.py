@@ -0,0 +1,195 @@
+import gzip
+import http.client
+import io
+import json
+import threading
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+import api_server
+import cache_manager
+from api_server import _build_response, _etag_matches, get_response, make_server
+from cache_manager import CacheManager
+from data_store import available_years, query
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    fresh = CacheManager(memory_budget=64 * 1024 * 1024)
+    monkeypatch.setattr(cache_manager, "_cache", fresh)
+    return fresh
+
+
+@pytest.fixture(scope="module")
+def server():
+    srv = make_server(port=0)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv.server_address[1]
+    srv.shutdown()
+    srv.server_close()
+
+
+def request(port: int, path: str, headers=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    conn.request("GET", path, headers=headers or {})
+    resp = conn.getresponse()
+    body = resp.read()
+    conn.close()
+    return resp, body
+
+
+# =========================
+# ETAG
+# =========================
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, False),
+        ("", False),
+        ('"v1-abc"', True),
+        ('W/"v1-abc"', True),
+        ("*", True),
+        (' "other", "v1-abc" ', True),
+        ('"other"', False),
+        ('"v1-ab"', False),
+    ],
+)
+def test_etag_matches(header, expected):
+    assert _etag_matches(header, '"v1-abc"') is expected
+
+
+def test_if_none_match_returns_304_without_body(server):
+    resp, body = request(server, "/api/indicators")
+    etag = resp.getheader("ETag")
+    assert resp.status == 200 and etag
+
+    for header in (etag, f"W/{etag}", "*", f'"stale", {etag}'):
+        resp, body = request(server, "/api/indicators", {"If-None-Match": header})
+        assert resp.status == 304
+        assert resp.getheader("ETag") == etag
+        assert body == b""
+
+    resp, _ = request(server, "/api/indicators", {"If-None-Match": '"stale"'})
+    assert resp.status == 200
+
+
+# =========================
+# GZIP
+# =========================
+def test_gzip_only_when_accepted_and_large_enough(server):
+    resp, plain = request(server, "/api/countries")
+    assert resp.getheader("Content-Encoding") is None
+
+    resp, packed = request(server, "/api/countries", {"Accept-Encoding": "gzip"})
+    assert resp.getheader("Content-Encoding") == "gzip"
+    assert resp.getheader("Vary") == "Accept-Encoding"
+    assert gzip.decompress(packed) == plain
+
+    # Body kecil (di bawah GZIP_MIN_BYTES) tidak di-gzip
+    resp, small = request(server, "/api/version", {"Accept-Encoding": "gzip"})
+    assert len(small) < api_server.GZIP_MIN_BYTES
+    assert resp.getheader("Content-Encoding") is None
+
+
+def test_gzip_threshold(monkeypatch):
+    body_len = len(_build_response("/api/version", {}, "v").body)
+
+    monkeypatch.setattr(api_server, "GZIP_MIN_BYTES", body_len + 1)
+    assert _build_response("/api/version", {}, "v").gzip_body is None
+
+    monkeypatch.setattr(api_server, "GZIP_MIN_BYTES", body_len)
+    resp = _build_response("/api/version", {}, "v")
+    assert gzip.decompress(resp.gzip_body) == resp.body
+
+
+# =========================
+# CACHE & ERROR
+# =========================
+def test_cache_key_uses_declared_parameters_only(cache):
+    year = str(available_years()[-1])
+    first = get_response("/api/summary", {"year": year})
+    for buster in range(5):
+        assert get_response("/api/summary", {"year": year, "_": str(buster)}) is first
+    assert cache.stats()["namespaces"]["api"]["entries"] == 1
+
+
+@pytest.mark.parametrize(
+    "path, params, status",
+    [
+        ("/api/nope", {}, 404),
+        ("/api/summary", {}, 400),
+        ("/api/summary", {"year": "abc"}, 400),
+        ("/api/summary", {"year": "1800"}, 404),
+        ("/api/rankings", {"indicator": "Unknown", "year": "2020"}, 400),
+        ("/api/rankings", {"indicator": "Female LFP", "year": "2020", "n": "0"}, 400),
+        ("/api/rankings", {"indicator": "Female LFP", "year": "2020", "order": "mid"}, 400),
+        ("/api/profile", {}, 400),
+        ("/api/profile", {"country": "Atlantis"}, 404),
+    ],
+)
+def test_error_status_is_not_cached(cache, path, params, status):
+    resp = get_response(path, params)
+    assert resp.status == status
+    assert "error" in json.loads(resp.body)
+    assert cache.stats()["namespaces"].get("api", {}).get("entries", 0) == 0
+
+
+def test_profile_accepts_code_and_alias(cache):
+    by_code = json.loads(get_response("/api/profile", {"country": "KOR"}).body)
+    by_alias = json.loads(get_response("/api/profile", {"country": "South Korea"}).body)
+    assert by_code["country_code"] == by_alias["country_code"] == "KOR"
+    assert by_code["series"] == by_alias["series"]
+
+
+def test_http_error_status(server):
+    resp, body = request(server, "/api/does-not-exist")
+    assert resp.status == 404
+    assert resp.getheader("ETag") is None
+    assert "error" in json.loads(body)
+
+
+# =========================
+# EXPORT
+# =========================
+def test_export_csv_streams_chunked(server):
+    resp, body = request(server, "/api/export?format=csv")
+    assert resp.status == 200
+    assert resp.getheader("Transfer-Encoding") == "chunked"
+    assert resp.getheader("Content-Type") == "text/csv"
+
+    exported = pd.read_csv(io.BytesIO(body))
+    expected = query()
+    assert len(exported) == len(expected)
+    assert exported["value"].sum() == pytest.approx(expected["value"].sum())
+
+
+def test_export_parquet_with_selection(server):
+    resp, body = request(
+        server,
+        "/api/export?format=parquet&indicator=Female+LFP&year=2019&year=2020"
+        "&country=IDN&country=Japan&column=country_code&column=year&column=value",
+    )
+    assert resp.status == 200
+    assert "female_lfp_2019_2020.parquet" in resp.getheader("Content-Disposition")
+
+    exported = pq.read_table(io.BytesIO(body)).to_pandas()
+    expected = query(
+        indicators=["Female LFP"], years=[2019, 2020], countries=["IDN", "Japan"],
+        columns=["country_code", "year", "value"],
+    )
+    assert list(exported.columns) == ["country_code", "year", "value"]
+    pd.testing.assert_frame_equal(
+        exported.sort_values(["country_code", "year"]).reset_index(drop=True),
+        expected.sort_values(["country_code", "year"]).reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+@pytest.mark.parametrize("query_string", ["format=xls", "year=abc", "indicator=zz", "column=foo"])
+def test_export_rejects_bad_selection(server, query_string):
+    resp, body = request(server, f"/api/export?{query_string}")
+    assert resp.status == 400
+    assert "error" in json.loads(body)
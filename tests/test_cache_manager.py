@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import cache_manager
+from cache_manager import CacheManager, estimate_size
+
+
+def blob(n: int) -> np.ndarray:
+    # estimate_size() untuk ndarray = nbytes, jadi ukurannya pasti n byte
+    return np.zeros(n, dtype=np.uint8)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_manager.time, "monotonic", lambda: now[0])
+    return now
+
+
+def make_cache(**kwargs) -> CacheManager:
+    kwargs.setdefault("memory_budget", 100)
+    kwargs.setdefault("namespace_ttls", {"t": None})
+    return CacheManager(**kwargs)
+
+
+# =========================
+# AKUNTANSI UKURAN
+# =========================
+def test_estimate_size_known_types():
+    assert estimate_size(blob(64)) == 64
+    df = pd.DataFrame({"a": np.arange(10, dtype="int64")})
+    assert estimate_size(df) == int(df.memory_usage(deep=True).sum())
+    assert estimate_size((blob(10), blob(20))) > 30
+
+
+def test_used_bytes_tracks_put_replace_and_invalidate():
+    cache = make_cache()
+    cache.put("t", "a", blob(30))
+    cache.put("t", "b", blob(20))
+    assert cache.used_bytes == 50
+
+    cache.put("t", "a", blob(10))
+    assert cache.used_bytes == 30
+
+    assert cache.invalidate("t") == 2
+    assert cache.used_bytes == 0
+
+
+def test_value_larger_than_budget_is_rejected():
+    cache = make_cache()
+    assert cache.put("t", "big", blob(101)) is False
+    assert not cache.contains("t", "big")
+    assert cache.stats()["namespaces"]["t"]["rejected"] == 1
+
+
+# =========================
+# EVICTION
+# =========================
+def test_lru_evicts_least_recently_used():
+    cache = make_cache(policy="lru")
+    for key in "abc":
+        cache.put("t", key, blob(30))
+    cache.get("t", "a")
+
+    cache.put("t", "d", blob(30))
+
+    assert not cache.contains("t", "b")
+    assert all(cache.contains("t", k) for k in "acd")
+    assert cache.used_bytes <= 100
+
+
+def test_lfu_evicts_least_frequently_used_oldest_first_on_tie():
+    cache = make_cache(policy="lfu")
+    for key in "abc":
+        cache.put("t", key, blob(30))
+    for _ in range(3):
+        cache.get("t", "a")
+    cache.get("t", "c")
+
+    cache.put("t", "d", blob(30))
+
+    # b dan d sama-sama 0 hit; b lebih lama tidak diakses
+    assert not cache.contains("t", "b")
+    assert all(cache.contains("t", k) for k in "acd")
+
+
+def test_unknown_policy_raises():
+    with pytest.raises(ValueError):
+        CacheManager(policy="fifo")
+
+
+# =========================
+# TTL
+# =========================
+def test_namespace_ttl_expires_on_access(clock):
+    cache = make_cache(namespace_ttls={"short": 10, "t": None})
+    cache.put("short", "k", blob(1))
+    cache.put("t", "k", blob(1))
+
+    clock[0] += 9
+    assert cache.get("short", "k") is not None
+
+    clock[0] += 2
+    assert cache.get("short", "k", "gone") == "gone"
+    assert cache.get("t", "k") is not None
+    assert cache.stats()["namespaces"]["short"]["expirations"] == 1
+
+
+def test_expired_entries_are_dropped_before_evicting_live_ones(clock):
+    cache = make_cache(namespace_ttls={"short": 5, "t": None})
+    cache.put("t", "live", blob(50))
+    cache.put("short", "old", blob(40))
+
+    clock[0] += 6
+    cache.put("t", "new", blob(40))
+
+    assert cache.contains("t", "live")
+    assert cache.contains("t", "new")
+    assert cache.stats()["evictions"] == 0
+
+
+def test_set_ttl_applies_to_new_entries(clock):
+    cache = make_cache()
+    cache.set_ttl("t", 1)
+    cache.put("t", "k", blob(1))
+    clock[0] += 2
+    assert not cache.contains("t", "k")
+
+
+# =========================
+# LISTENER & STATS
+# =========================
+def test_listener_reasons(clock):
+    cache = make_cache(namespace_ttls={"short": 1, "t": None})
+    events = []
+    cache.add_listener(lambda ns, key, reason: events.append((ns, key, reason)))
+
+    cache.put("t", "a", blob(60))
+    cache.put("t", "a", blob(60))
+    cache.put("t", "b", blob(60))
+    cache.put("short", "s", blob(1))
+    clock[0] += 2
+    cache.get("short", "s")
+    cache.invalidate()
+
+    assert events == [
+        ("t", "a", "replaced"),
+        ("t", "a", "evicted"),
+        ("short", "s", "expired"),
+        ("t", "b", "invalidated"),
+    ]
+
+
+def test_listener_may_call_back_into_cache():
+    cache = make_cache()
+    seen = []
+    cache.add_listener(lambda ns, key, reason: seen.append(cache.contains(ns, key)))
+    cache.put("t", "a", blob(60))
+    cache.put("t", "b", blob(60))
+    assert seen == [False]
+
+
+def test_get_or_compute_computes_once_and_counts_hits():
+    cache = make_cache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return blob(8)
+
+    first = cache.get_or_compute("t", "k", compute)
+    second = cache.get_or_compute("t", "k", compute)
+
+    assert first is second
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["namespaces"]["t"]["entries"] == 1
+    assert stats["namespaces"]["t"]["bytes"] == 8
+    assert stats["hit_rate"] == 0.5
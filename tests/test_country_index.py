@@ -0,0 +1,105 @@
+import pytest
+
+from country_index import CountryIndex, normalize
+
+PAIRS = [
+    ("Indonesia", "IDN"),
+    ("India", "IND"),
+    ("United States", "USA"),
+    ("United Kingdom", "GBR"),
+    ("United Arab Emirates", "ARE"),
+    ("Korea, Rep.", "KOR"),
+    ("Korea, Dem. People's Rep.", "PRK"),
+    ("Cote d'Ivoire", "CIV"),
+    ("Bahamas, The", "BHS"),
+    ("Georgia", "GEO"),
+    ("Georgia", "US-GA"),
+    ("Punjab", "IN-PB"),
+    ("Punjab", "PK-PB"),
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return CountryIndex(PAIRS)
+
+
+def test_normalize():
+    assert normalize("  Côte d'Ivoire ") == "cote d ivoire"
+    assert normalize("KOREA, Rep.") == "korea rep"
+
+
+def test_codes_sorted_by_name_then_code(index):
+    assert len(index) == len(PAIRS)
+    names = [index.name(c) for c in index.codes]
+    assert names == sorted(names)
+    assert index.codes.index("GEO") < index.codes.index("US-GA")
+
+
+def test_position_and_default(index):
+    assert index.codes[index.position("IDN")] == "IDN"
+    assert index.position("XXX") == 0
+    assert index.position("XXX", default=-1) == -1
+
+
+def test_label(index):
+    assert index.label("IDN") == "Indonesia (IDN)"
+    assert index.label("XXX") == "XXX"
+
+
+def test_sorted_subset_uses_index_order_and_dedupes(index):
+    subset = index.sorted_subset(["USA", "IDN", "ARE", "IDN", "ZZZ"])
+    assert subset == ["IDN", "ARE", "USA", "ZZZ"]
+
+
+@pytest.mark.parametrize(
+    "text, code",
+    [
+        ("Indonesia", "IDN"),
+        ("idn", "IDN"),
+        ("  INDONESIA ", "IDN"),
+        ("South Korea", "KOR"),
+        ("UK", "GBR"),
+        ("Amerika Serikat", "USA"),
+        ("Côte d'Ivoire", "CIV"),
+        ("The Bahamas", "BHS"),
+        ("Bahamas", "BHS"),
+        ("Atlantis", None),
+    ],
+)
+def test_lookup_name_code_and_alias(index, text, code):
+    assert index.lookup(text) == code
+
+
+def test_search_exact_first_then_prefix(index):
+    assert index.search("ind")[:2] == ["IND", "IDN"]
+    assert index.search("india")[0] == "IND"
+    assert index.search("") == []
+
+
+def test_search_matches_word_suffix_prefix(index):
+    # "states" / "kingdom" adalah awal kata kedua
+    assert index.search("states")[0] == "USA"
+    assert index.search("king")[0] == "GBR"
+    assert set(index.search("united", limit=3)) == {"USA", "GBR", "ARE"}
+
+
+def test_search_typo_uses_fuzzy(index):
+    assert index.search("Indnesia")[0] == "IDN"
+    assert index.search("Untied States")[0] == "USA"
+    assert index.search("qqqqqq") == []
+
+
+def test_search_respects_limit(index):
+    assert len(index.search("u", limit=2)) == 2
+
+
+def test_duplicate_names_stay_distinct(index):
+    assert index.search("punjab") == ["IN-PB", "PK-PB"]
+    assert index.search("pnjab")[:2] == ["IN-PB", "PK-PB"]
+    assert {index.label(c) for c in index.search("georgia")} == {
+        "Georgia (GEO)", "Georgia (US-GA)",
+    }
+    assert index.lookup("PK-PB") == "PK-PB"
+    # Auto alias "Korea" dipakai dua negara
+    assert set(index.search("korea")[:2]) == {"KOR", "PRK"}
@@ -0,0 +1,114 @@
+import pandas as pd
+import pytest
+
+import cache_manager
+import data_store
+from cache_manager import CacheManager
+from data_store import available_years, build_store, iter_batches, query
+
+LFP_CSV = (
+    "Country Name;Country Code;1995;1996;1997\n"
+    "Indonesia;IDN;50,5;51;\n"
+    "Japan;JPN;48;49;50\n"
+    "Aruba;ABW;;;\n"
+    "Kenya;KEN;70;71,5;72\n"
+)
+MMR_CSV = (
+    "Country Name;Country Code;1995;1996\n"
+    "Indonesia;IDN;300;290\n"
+    "Kenya;KEN;700;\n"
+)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "lfp.csv").write_text(LFP_CSV, encoding="utf-8")
+    (data_dir / "mmr.csv").write_text(MMR_CSV, encoding="utf-8")
+
+    store_dir = data_dir / ".store"
+    monkeypatch.setattr(data_store, "DATA_DIR", str(data_dir))
+    monkeypatch.setattr(data_store, "STORE_DIR", str(store_dir))
+    monkeypatch.setattr(data_store, "LOCK_FILE", str(store_dir / ".build.lock"))
+    monkeypatch.setattr(
+        data_store, "INDICATOR_FILES",
+        {"Female LFP": "lfp.csv", "Maternal Mortality": "mmr.csv"},
+    )
+    monkeypatch.setattr(data_store, "ROW_GROUP_SIZE", 2)
+    monkeypatch.setattr(cache_manager, "_cache", CacheManager())
+    build_store()
+    return store_dir
+
+
+def test_query_long_format_drops_missing_values(store):
+    df = query()
+    assert list(df.columns) == data_store.LONG_COLUMNS
+    assert len(df) == 8 + 3
+    assert "ABW" not in set(df["country_code"])
+    assert df["year"].dtype == "int64"
+
+
+def test_year_projection(store):
+    df = query(years=[1996, 2050])
+    assert set(df["year"]) == {1996}
+    assert available_years() == [1995, 1996, 1997]
+    assert query(years=[2050]).empty
+
+
+def test_column_projection(store):
+    df = query(indicators=["Female LFP"], years=[1997], columns=["value", "country"])
+    assert list(df.columns) == ["country", "value"]
+    assert sorted(df["value"]) == [50.0, 72.0]
+
+
+@pytest.mark.parametrize("country", ["Indonesia", "IDN"])
+def test_country_filter_by_name_or_code_without_id_columns(store, country):
+    df = query(countries=[country], columns=["year", "value", "indicator"])
+    assert list(df.columns) == ["year", "value", "indicator"]
+    assert sorted(df["value"]) == [50.5, 51.0, 290.0, 300.0]
+
+
+def test_country_filter_mixed_and_unknown(store):
+    df = query(indicators=["Maternal Mortality"], countries=["KEN", "Japan", "Atlantis"])
+    assert df[["country_code", "year", "value"]].values.tolist() == [["KEN", 1995, 700.0]]
+
+
+def test_empty_countries_list(store):
+    df = query(countries=[], columns=["country", "value"])
+    assert df.empty
+    assert list(df.columns) == ["country", "value"]
+    assert list(iter_batches(countries=[])) == []
+
+
+def test_unknown_indicator_is_ignored(store):
+    assert query(indicators=["Nope"]).empty
+    assert set(query(indicators=["Nope", "Female LFP"])["indicator"]) == {"Female LFP"}
+
+
+@pytest.mark.parametrize(
+    "selection",
+    [
+        {},
+        {"years": [1996]},
+        {"countries": ["Japan", "KEN"], "columns": ["country_code", "year", "value"]},
+        {"indicators": ["Female LFP"], "columns": ["value"]},
+    ],
+)
+def test_iter_batches_matches_query(store, selection):
+    expected = query(**selection)
+    batches = list(iter_batches(batch_size=1, **selection))
+    assert len(batches) > 1
+    streamed = pd.concat(batches, ignore_index=True)
+
+    def ordered(df):
+        return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(ordered(streamed), ordered(expected))
+
+
+def test_query_result_is_cached_per_data_version(store):
+    first = query(years=[1995])
+    assert query(years=[1995]) is first
+    assert build_store() == []
+    assert query(years=[1995]) is first
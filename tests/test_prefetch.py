@@ -0,0 +1,116 @@
+import threading
+
+import numpy as np
+import pytest
+
+from cache_manager import CacheManager
+from prefetch import Prefetcher, neighbour_years
+
+
+def blob(n: int) -> np.ndarray:
+    return np.zeros(n, dtype=np.uint8)
+
+
+@pytest.fixture
+def cache():
+    return CacheManager(memory_budget=1000, namespace_ttls={"t": None})
+
+
+@pytest.fixture
+def prefetcher(cache):
+    p = Prefetcher(cache, max_workers=1, memory_budget=500)
+    yield p
+    p._executor.shutdown(wait=True)
+
+
+def wait(prefetcher):
+    prefetcher._executor.submit(lambda: None).result()
+
+
+def test_prefetched_value_is_used(prefetcher):
+    prefetcher.prefetch("t", "k", lambda: blob(10))
+    wait(prefetcher)
+
+    value = prefetcher.get("t", "k", lambda: pytest.fail("tidak boleh dihitung ulang"))
+
+    assert len(value) == 10
+    stats = prefetcher.stats()
+    assert (stats["prefetch_used"], stats["prefetch_wasted"]) == (1, 0)
+    assert stats["unused_bytes"] == 0
+
+
+def test_get_waits_for_pending_prefetch(prefetcher):
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return blob(10)
+
+    prefetcher.prefetch("t", "k", slow)
+    started.wait(5)
+    threading.Timer(0.05, release.set).start()
+
+    value = prefetcher.get("t", "k", lambda: pytest.fail("tidak boleh dihitung ulang"))
+
+    assert len(value) == 10
+    assert prefetcher.stats()["prefetch_used"] == 1
+
+
+def test_foreground_result_wins_and_prefetch_counts_as_wasted(prefetcher, cache):
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return blob(10)
+
+    prefetcher.prefetch("t", "k", slow)
+    started.wait(5)
+    foreground = blob(20)
+    cache.put("t", "k", foreground)
+    release.set()
+    wait(prefetcher)
+
+    assert cache.get("t", "k") is foreground
+    stats = prefetcher.stats()
+    assert stats["prefetch_wasted"] == 1
+    assert stats["unused_bytes"] == 0
+
+
+def test_prefetch_skips_value_already_cached_when_it_starts(prefetcher, cache):
+    gate = threading.Event()
+    prefetcher._executor.submit(gate.wait, 5)
+    calls = []
+    prefetcher.prefetch("t", "k", lambda: calls.append(1) or blob(10))
+    cache.put("t", "k", blob(20))
+    gate.set()
+    wait(prefetcher)
+
+    assert calls == []
+    assert len(prefetcher.get("t", "k", lambda: pytest.fail("tidak boleh dihitung"))) == 20
+
+
+def test_evicted_prefetch_counts_as_wasted(prefetcher, cache):
+    prefetcher.prefetch("t", "old", lambda: blob(400))
+    wait(prefetcher)
+    cache.put("t", "big", blob(700))
+
+    stats = prefetcher.stats()
+    assert stats["prefetch_wasted"] == 1
+    assert stats["unused_bytes"] == 0
+
+
+def test_prefetch_skipped_over_budget(prefetcher):
+    prefetcher.prefetch("t", "a", lambda: blob(600))
+    wait(prefetcher)
+    prefetcher.prefetch("t", "b", lambda: blob(10))
+
+    assert prefetcher.stats()["prefetch_skipped_budget"] == 1
+
+
+def test_neighbour_years():
+    years = [2000, 2001, 2002, 2005]
+    assert neighbour_years(years, 2001) == [2000, 2002]
+    assert neighbour_years(years, 2005, radius=2) == [2001, 2002]
+    assert neighbour_years(years, 1999) == []
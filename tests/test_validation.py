@@ -0,0 +1,169 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from validation import (
+    SchemaError,
+    classify_columns,
+    parse_numbers,
+    summarize,
+    validate_wb_frame,
+)
+
+
+def read(text: str) -> pd.DataFrame:
+    # Sama seperti data_store.read_wb_csv
+    return pd.read_csv(
+        io.StringIO(text), sep=";", engine="python", dtype=str, keep_default_na=False
+    )
+
+
+def validate(text: str, indicator: str = "Female LFP"):
+    return validate_wb_frame(read(text), indicator, "test.csv", 1995, 2023)
+
+
+# =========================
+# HEADER
+# =========================
+def test_classify_columns_year_formats_and_range():
+    columns = ["Country Name", "Country Code", "1994", "1995", "1996 [YR1996]", "2024"]
+    year_cols, bad = classify_columns(columns, 1995, 2023)
+    assert year_cols == {"1995": "1995", "1996": "1996 [YR1996]"}
+    assert bad == []
+
+
+def test_classify_columns_bad_headers():
+    columns = ["1995", "1995 [YR1996]", "YR1997", "1998", "1998 [YR1998]", "1999.1", "Notes"]
+    year_cols, bad = classify_columns(columns, 1995, 2023)
+    assert year_cols == {"1995": "1995", "1998": "1998"}
+    assert bad == [
+        ("1995 [YR1996]", "invalid_year_header"),
+        ("YR1997", "invalid_year_header"),
+        ("1998 [YR1998]", "duplicate_year"),
+        ("1999.1", "duplicate_year"),
+        ("Notes", "unknown_column"),
+    ]
+
+
+def test_classify_columns_skips_metadata_and_trailing_empty_column():
+    columns = ["Series Name", "Series Code", "Country Name", "Country Code", "1995", "Unnamed: 5"]
+    year_cols, bad = classify_columns(columns, 1995, 2023)
+    assert year_cols == {"1995": "1995"}
+    assert bad == []
+
+
+# =========================
+# ANGKA
+# =========================
+def test_parse_numbers_decimal_comma_and_thousands():
+    cells = pd.Series(["1,5", "1.414", "12.345,6", "1 234,5", "1 000", "", "-3", "abc", "1,2,3"])
+    values, bad = parse_numbers(cells)
+    expected = [1.5, 1414.0, 12345.6, 1234.5, 1000.0, np.nan, -3.0, np.nan, np.nan]
+    np.testing.assert_array_equal(values.to_numpy(), expected)
+    assert bad.tolist() == [False] * 7 + [True, True]
+
+
+# =========================
+# VALIDASI FILE
+# =========================
+def test_validate_clean_file():
+    wide, quarantine = validate(
+        "Country Name;Country Code;1995;1996\n"
+        "Aruba;ABW;;\n"
+        "Indonesia;IDN;50,5;51\n"
+    )
+    assert list(wide.columns) == ["country", "country_code", "1995", "1996"]
+    assert wide.loc[wide["country_code"] == "IDN", "1995"].item() == 50.5
+    assert quarantine.empty
+
+
+def test_validate_quarantines_bad_cells_and_rows():
+    wide, quarantine = validate(
+        "Country Name;Country Code;1995;1996\n"
+        "A;AAA;abc;50\n"
+        "B;BBB;150;40\n"
+        "C;;1;2\n"
+        "A again;AAA;1;2\n"
+    )
+    reasons = quarantine.set_index(["row", "reason"])["raw_value"].to_dict()
+    assert reasons == {
+        (2, "not_numeric"): "abc",
+        (3, "out_of_range"): "150",
+        (4, "missing_country_code"): "C",
+        (5, "duplicate_country_code"): "A again",
+    }
+    # Sel dikarantina jadi NaN, baris ganda/tanpa kode dibuang
+    assert wide["country_code"].tolist() == ["AAA", "BBB"]
+    assert np.isnan(wide["1995"]).all()
+    assert wide["1996"].tolist() == [50.0, 40.0]
+
+
+def test_validate_range_depends_on_indicator():
+    text = "Country Name;Country Code;1995\nA;AAA;150\n"
+    _, lfp = validate(text, "Female LFP")
+    _, enrol = validate(text, "Female Secondary Enrolment")
+    _, mmr = validate("Country Name;Country Code;1995\nA;AAA;-1\n", "Maternal Mortality")
+    assert lfp["reason"].tolist() == ["out_of_range"]
+    assert enrol.empty
+    assert mmr["reason"].tolist() == ["out_of_range"]
+
+
+def test_validate_short_row_missing_cells_are_empty_not_malformed():
+    wide, quarantine = validate(
+        "Country Name;Country Code;1995;1996;1997;Bad\n"
+        "A;AAA;1;2;3;x\n"
+        "E;EEE;10;1 234,5\n",
+        "Maternal Mortality",
+    )
+    assert quarantine[["row", "column", "raw_value", "reason"]].values.tolist() == [
+        [1, "Bad", "Bad", "unknown_column"],
+    ]
+    row = wide[wide["country_code"] == "EEE"].iloc[0]
+    assert row["1996"] == 1234.5
+    assert np.isnan(row["1997"])
+    assert quarantine["raw_value"].notna().all()
+
+
+def test_validate_databank_export_does_not_flood_report():
+    wide, quarantine = validate(
+        "Series Name;Series Code;Country Name;Country Code;1995 [YR1995];1996 [YR1996]\n"
+        "LFP;SL.TLF;A;AAA;1;2\n"
+        "LFP;SL.TLF;B;BBB;3;4\n"
+    )
+    assert quarantine.empty
+    assert wide["1996"].tolist() == [2.0, 4.0]
+
+
+def test_validate_bad_year_header_quarantines_filled_cells_only():
+    _, quarantine = validate(
+        "Country Name;Country Code;1995;YR1996\n"
+        "A;AAA;1;5\n"
+        "B;BBB;2;\n"
+    )
+    assert quarantine[["row", "column", "raw_value", "reason"]].values.tolist() == [
+        [2, "YR1996", "5", "invalid_year_header"],
+    ]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Name;Country Code;1995\nA;AAA;1\n",
+        "Country Name;Country Code;1990;Notes\nA;AAA;1;x\n",
+    ],
+)
+def test_validate_schema_errors(text):
+    with pytest.raises(SchemaError):
+        validate(text)
+
+
+def test_summarize_counts_per_indicator_and_reason():
+    _, quarantine = validate(
+        "Country Name;Country Code;1995;1996\n"
+        "A;AAA;abc;def\n"
+        "B;BBB;150;1\n"
+    )
+    counts = summarize(quarantine).set_index("reason")["count"].to_dict()
+    assert counts == {"not_numeric": 2, "out_of_range": 1}
@@ -0,0 +1,266 @@
+"""
+Validasi data World Bank saat ingest (CSV -> store), sekali jalan dan
+tervektorisasi per file.
+
+Yang diperiksa:
+- schema: kolom 'Country Name' / 'Country Code' ada, header tahun berbentuk
+  "1995" atau "1995 [YR1995]", tidak ada tahun ganda; kolom metadata
+  DataBank ("Series Name", ...) dilewati, kolom asing lain dicatat sekali
+- kode negara kosong atau ganda (baris kedua dst. dikarantina)
+- sel yang tidak bisa dibaca sebagai angka (setelah membuang pemisah ribuan)
+- nilai di luar rentang wajar per indikator
+
+Sel/baris yang gagal tidak dibuang diam-diam tetapi dicatat di laporan
+karantina (file, baris, kolom, nilai mentah, alasan). `data_store` menyimpan
+laporan ini bersama store Parquet, jadi warm start tidak memvalidasi ulang.
+
+    python validation.py            # tampilkan ringkasan karantina
+    python validation.py --details  # tampilkan semua sel yang dikarantina
+"""
+import argparse
+import re
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+ID_SOURCE_COLUMNS = ["Country Name", "Country Code"]
+
+# Kolom metadata standar export World Bank / DataBank, bukan data tahunan
+METADATA_COLUMNS = {"Series Name", "Series Code", "Indicator Name", "Indicator Code"}
+
+QUARANTINE_COLUMNS = ["indicator", "file", "row", "column", "country_code", "raw_value", "reason"]
+
+# Rentang nilai wajar per indikator (batas bawah, batas atas)
+VALUE_RANGES: Dict[str, Tuple[float, float]] = {
+    # persentase
+    "Female LFP": (0.0, 100.0),
+    # gross enrolment bisa > 100% (murid di luar kelompok umur resmi)
+    "Female Secondary Enrolment": (0.0, 200.0),
+    # per 100.000 kelahiran hidup, tidak boleh negatif
+    "Maternal Mortality": (0.0, np.inf),
+}
+
+YEAR_HEADER = re.compile(r"^(\d{4})(?: \[YR(\d{4})\])?$")
+# pandas menamai header ganda "1997", "1997.1", ...
+MANGLED_HEADER = re.compile(r"^(.+)\.\d+$")
+# Header yang memuat angka tahun tapi formatnya salah, mis. "YR1995", "1995*"
+YEAR_LIKE = re.compile(r"\d{4}")
+# Angka dengan titik sebagai pemisah ribuan, mis. "1.414" atau "12.345,6"
+THOUSANDS = r"-?\d{1,3}(?:\.\d{3})+(?:,\d*)?"
+
+
+class SchemaError(ValueError):
+    """File tidak bisa dipakai sama sekali (kolom identitas hilang / tidak ada tahun)."""
+
+
+def _quarantine(indicator: str, filename: str, **cols) -> pd.DataFrame:
+    df = pd.DataFrame(cols)
+    df.insert(0, "file", filename)
+    df.insert(0, "indicator", indicator)
+    return df[QUARANTINE_COLUMNS]
+
+
+def empty_quarantine() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "indicator": pd.Series(dtype="str"),
+            "file": pd.Series(dtype="str"),
+            "row": pd.Series(dtype="int64"),
+            "column": pd.Series(dtype="str"),
+            "country_code": pd.Series(dtype="str"),
+            "raw_value": pd.Series(dtype="str"),
+            "reason": pd.Series(dtype="str"),
+        }
+    )
+
+
+def classify_columns(
+    columns: List[str], year_min: int, year_max: int
+) -> Tuple[Dict[str, str], List[Tuple[str, str]]]:
+    """
+    Pisahkan kolom tahun dari kolom lain.
+    Mengembalikan ({"1995": header_asli, ...}, [(header, alasan), ...]).
+    Tahun di luar rentang dan kolom metadata diabaikan tanpa dikarantina.
+    Kolom tanpa angka tahun sama sekali diberi alasan "unknown_column"
+    (dilaporkan sekali per kolom, bukan per sel).
+    """
+    year_cols: Dict[str, str] = {}
+    bad: List[Tuple[str, str]] = []
+
+    for c in columns:
+        header = str(c).strip()
+        if c in ID_SOURCE_COLUMNS or header in METADATA_COLUMNS:
+            continue
+        match = YEAR_HEADER.match(header)
+        if match is None:
+            # Kolom kosong di ujung baris (separator ; di akhir) bukan masalah
+            if header.startswith("Unnamed:") or header == "":
+                continue
+            mangled = MANGLED_HEADER.match(header)
+            if mangled and YEAR_HEADER.match(mangled.group(1)):
+                bad.append((c, "duplicate_year"))
+            elif not YEAR_LIKE.search(header):
+                bad.append((c, "unknown_column"))
+            else:
+                bad.append((c, "invalid_year_header"))
+            continue
+        year, tagged = match.group(1), match.group(2)
+        if tagged is not None and tagged != year:
+            bad.append((c, "invalid_year_header"))
+            continue
+        if not year_min <= int(year) <= year_max:
+            continue
+        if year in year_cols:
+            bad.append((c, "duplicate_year"))
+            continue
+        year_cols[year] = c
+
+    return year_cols, bad
+
+
+def parse_numbers(cells: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Ubah sel teks (desimal koma) ke float secara tervektorisasi.
+    Mengembalikan (nilai, mask sel tidak kosong yang gagal dibaca).
+    """
+    # Spasi (termasuk non-breaking space) bisa dipakai sebagai pemisah ribuan
+    text = cells.str.replace("[\\s\u00a0]", "", regex=True)
+    empty = text == ""
+    text = text.where(~text.str.fullmatch(THOUSANDS), text.str.replace(".", "", regex=False))
+    text = text.str.replace(",", ".", regex=False)
+    values = pd.to_numeric(text, errors="coerce")
+    return values.astype("float64"), ~empty & values.isna()
+
+
+def validate_wb_frame(
+    raw: pd.DataFrame,
+    indicator: str,
+    filename: str,
+    year_min: int,
+    year_max: int,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Validasi CSV World Bank yang dibaca sebagai teks (dtype=str).
+    Mengembalikan (wide bersih: country | country_code | 1995 | ..., karantina).
+    """
+    missing = [c for c in ID_SOURCE_COLUMNS if c not in raw.columns]
+    if missing:
+        raise SchemaError(f"Kolom {missing} tidak ditemukan di {filename}")
+
+    year_cols, bad_cols = classify_columns(list(raw.columns), year_min, year_max)
+    if not year_cols:
+        raise SchemaError(f"Tidak ada kolom tahun {year_min}-{year_max} di {filename}")
+
+    # Baris yang lebih pendek dari header memberi NaN, bukan "" (walaupun
+    # keep_default_na=False); dianggap sel kosong, bukan sel rusak
+    raw = raw.fillna("")
+
+    # Nomor baris di file: header = baris 1
+    line_no = pd.Series(np.arange(len(raw)) + 2, index=raw.index)
+    codes = raw["Country Code"].str.strip()
+    reports = []
+
+    # Kolom asing dicatat sekali (baris header); kolom tahun yang header-nya
+    # rusak: semua sel yang terisi dikarantina
+    for col, reason in bad_cols:
+        if reason == "unknown_column":
+            reports.append(_quarantine(
+                indicator, filename,
+                row=[1], column=[str(col)], country_code=[""], raw_value=[str(col)],
+                reason=reason,
+            ))
+            continue
+        filled = raw[col] != ""
+        if filled.any():
+            reports.append(_quarantine(
+                indicator, filename,
+                row=line_no[filled], column=str(col), country_code=codes[filled],
+                raw_value=raw.loc[filled, col], reason=reason,
+            ))
+
+    # Kode negara kosong / ganda: seluruh baris dikarantina
+    bad_rows = (codes == "") | codes.duplicated(keep="first")
+    if bad_rows.any():
+        reports.append(_quarantine(
+            indicator, filename,
+            row=line_no[bad_rows], column="Country Code", country_code=codes[bad_rows],
+            raw_value=raw.loc[bad_rows, "Country Name"],
+            reason=np.where(codes[bad_rows] == "", "missing_country_code", "duplicate_country_code"),
+        ))
+    raw, codes, line_no = raw[~bad_rows], codes[~bad_rows], line_no[~bad_rows]
+
+    # Semua sel tahun diproses sekaligus sebagai satu Series panjang
+    ordered = sorted(year_cols)
+    cells = raw[[year_cols[y] for y in ordered]]
+    cells.columns = ordered
+    stacked = cells.stack()
+    values, not_numeric = parse_numbers(stacked)
+
+    lo, hi = VALUE_RANGES.get(indicator, (-np.inf, np.inf))
+    out_of_range = values.notna() & ((values < lo) | (values > hi))
+
+    for mask, reason in ((not_numeric, "not_numeric"), (out_of_range, "out_of_range")):
+        if mask.any():
+            rows = stacked.index[mask].get_level_values(0)
+            cols = stacked.index[mask].get_level_values(1)
+            reports.append(_quarantine(
+                indicator, filename,
+                row=line_no.loc[rows].to_numpy(), column=[year_cols[y] for y in cols],
+                country_code=codes.loc[rows].to_numpy(), raw_value=stacked[mask].to_numpy(),
+                reason=reason,
+            ))
+
+    values[out_of_range] = np.nan
+    wide_values = values.unstack().reindex(index=raw.index, columns=ordered)
+
+    wide = pd.concat(
+        [
+            pd.DataFrame({"country": raw["Country Name"].str.strip(), "country_code": codes}),
+            wide_values.astype("float64"),
+        ],
+        axis=1,
+    )
+
+    quarantine = pd.concat(reports, ignore_index=True) if reports else empty_quarantine()
+    quarantine["row"] = quarantine["row"].astype("int64")
+    return wide, quarantine
+
+
+def summarize(quarantine: pd.DataFrame) -> pd.DataFrame:
+    """Jumlah sel/baris dikarantina per indikator dan alasan."""
+    return (
+        quarantine.groupby(["indicator", "reason"])
+        .size()
+        .rename("count")
+        .reset_index()
+    )
+
+
+def main(argv: Optional[list] = None) -> int:
+    from data_store import build_store, quarantine_report
+
+    parser = argparse.ArgumentParser(description="Laporan karantina validasi data.")
+    parser.add_argument("--details", action="store_true", help="Tampilkan semua sel yang dikarantina.")
+    parser.add_argument("--rebuild", action="store_true", help="Bangun ulang store dan validasi ulang.")
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        build_store(force=True)
+
+    report = quarantine_report()
+    if report.empty:
+        print("Tidak ada data yang dikarantina.")
+        return 0
+
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(summarize(report).to_string(index=False))
+        if args.details:
+            print()
+            print(report.to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())